@@ -0,0 +1,63 @@
+""" AI_Scheduler object - spreads zombie steering over several frames.
+Zombies near the player steer every frame. The far away ones (whose direction hardly changes) take it
+in turns, one slice of them per frame. Every zombie still moves every frame. """
+import time
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, it's only needed for the array zombie handler.
+    numpy = None
+
+
+class AI_Scheduler:
+    """ Decides which zombies steer each frame and counts the ones that didn't. """
+    def __init__(self, slices=4, near_distance=0.15, budget=0.002):
+        self.slices = slices  # Far zombies steer once every this many frames.
+        self.near_distance = near_distance  # Screen widths.
+        self.budget = budget  # Seconds of steering per frame, after that only near zombies steer.
+        self.frame = 0
+        self.steered = 0  # Counters for the last frame.
+        self.deferred = 0  # Far zombies that weren't in this frame's slice.
+        self.over_budget = 0  # Zombies that should have steered, but the budget had run out.
+        self.total_deferred = 0
+
+    def update(self, main, zombies, grid):
+        """ Steer this frame's zombies, then move them all (zombie.advance).
+        The near zombies are found with grid (the zombie handler's Spatial_Hash). The grid was built last
+        tick, so it can still hold zombies that have died since - they're skipped. """
+        self.frame += 1
+        player = main.game.player
+        near = [zombie for zombie in grid.query(player.pos.x, player.pos.y, self.near_distance) if zombie.health > 0]
+        for zombie in near:
+            zombie.steer(main)
+        near_ids = set(map(id, near))
+        deadline = time.perf_counter() + self.budget
+        self.steered = len(near)
+        self.over_budget = 0
+        far_in_slice = 0
+        for zombie in zombies[self.frame % self.slices::self.slices]:
+            if id(zombie) in near_ids:
+                continue
+            far_in_slice += 1
+            if self.over_budget or (not far_in_slice % 32 and time.perf_counter() > deadline):
+                self.over_budget += 1
+                continue
+            zombie.steer(main)
+            self.steered += 1
+        self.deferred = len(zombies) - self.steered - self.over_budget
+        self.total_deferred += self.deferred + self.over_budget
+        for zombie in zombies:
+            zombie.advance(main)
+
+    def steer_mask(self, distances):
+        """ Array version for the array zombie handler: return a bool array of which zombies steer this frame,
+        given their distances to the player. (The array handler steers everything at once so it doesn't
+        need the time budget.) """
+        self.frame += 1
+        indices = numpy.arange(len(distances))
+        mask = (distances < self.near_distance) | (indices % self.slices == self.frame % self.slices)
+        self.steered = int(numpy.count_nonzero(mask))
+        self.deferred = len(distances) - self.steered
+        self.over_budget = 0
+        self.total_deferred += self.deferred
+        return mask
@@ -0,0 +1,176 @@
+""" Asset loading pipeline.
+Loads the images folder into a dictionary, converts every surface to the display format and
+turns animation folders (folders of numbered images) into lists of frames.
+Asset_Loader does the PNG decoding on a worker thread and keeps the decoded pixels in a cache
+file so later starts don't decode anything. """
+import glob
+import os
+import struct
+import threading
+import pygame
+
+# The cache file is HEADER (magic, version, number of images) then for every image ENTRY (path length,
+# mtime, width, height) followed by the utf-8 path and the raw RGBA pixels - no pickle, so nothing in
+# the file can run code.
+CACHE_MAGIC = b"TDSI"
+CACHE_VERSION = 2
+HEADER = struct.Struct("<4sBI")
+ENTRY = struct.Struct("<HdII")
+
+
+class Asset_Loader:
+    """ Loads the images in folder on a background thread.
+    Call start as early as possible, then images() when the images are first needed. """
+    def __init__(self, folder, cache_path=None):
+        self.folder = folder
+        self.cache_path = cache_path if cache_path is not None else folder.rstrip("/\\") + ".cache"
+        self.thread = None
+        self.decoded = None  # Images by name (sub-folders as sub-dicts), as (size, rgba bytes) not surfaces.
+        self.loaded = None
+        self.error = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def start(self):
+        """ Start decoding on a worker thread (does nothing if already started). """
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.decode, name="asset-loader", daemon=True)
+            self.thread.start()
+
+    def images(self):
+        """ Return the prepared image dictionary, waiting for the worker thread if needed.
+        Must be called from the main thread after the display mode has been set. """
+        if self.loaded is None:
+            self.start()
+            self.thread.join()
+            if self.error is not None:
+                raise RuntimeError("Couldn't load images from {}".format(self.folder)) from self.error
+            self.loaded = prepare(build_surfaces(self.decoded))
+        return self.loaded
+
+    def is_warm(self):
+        """ Did every image come from the cache file? """
+        return self.cache_hits > 0 and self.cache_misses == 0
+
+    def decode(self):
+        """ Decode every image in self.folder (or take it from the cache file if it hasn't changed).
+        Writes the cache file back if anything had to be decoded.
+        Any error is kept in self.error and raised from images() on the main thread. """
+        try:
+            cache = self.read_cache()
+            new_cache = {}
+            self.decoded = self.decode_folder(self.folder, cache, new_cache)
+            if self.cache_misses or len(new_cache) != len(cache):
+                self.write_cache(new_cache)
+        except Exception as error:  # pylint: disable=broad-except
+            # Nothing can be raised from the worker thread - images() raises it on the main thread.
+            self.error = error
+
+    def decode_folder(self, folder, cache, new_cache):
+        """ Return a dictionary of (size, rgba bytes) for the images in folder, sub-folders as sub-dicts. """
+        decoded = {}
+        for path in glob.glob(folder + "/*"):
+            if path.lower().endswith(".png"):
+                mtime = os.path.getmtime(path)
+                entry = cache.get(path)
+                if entry is not None and entry[0] == mtime:
+                    self.cache_hits += 1
+                else:
+                    self.cache_misses += 1
+                    image = pygame.image.load(path)
+                    entry = (mtime, image.get_size(), pygame.image.tostring(image, "RGBA"))
+                new_cache[path] = entry
+                decoded[file_name(path)] = entry[1:]
+            elif os.path.isdir(path):
+                decoded[file_name(path)] = self.decode_folder(path, cache, new_cache)
+        return decoded
+
+    def read_cache(self):
+        """ Return the {path: (mtime, size, rgba bytes)} dictionary from the cache file.
+        A missing, unreadable, corrupt or out of date cache file is just an empty cache. """
+        try:
+            with open(self.cache_path, "rb") as file:
+                data = file.read()
+            return parse_cache(data)
+        except (OSError, ValueError, struct.error, UnicodeDecodeError):
+            return {}
+
+    def write_cache(self, cache):
+        """ Save the cache dictionary. Failing to save isn't fatal, it just means a cold start next time. """
+        temp_path = self.cache_path + ".tmp"
+        try:
+            with open(temp_path, "wb") as file:
+                file.write(HEADER.pack(CACHE_MAGIC, CACHE_VERSION, len(cache)))
+                for path, (mtime, size, pixels) in cache.items():
+                    encoded_path = path.encode("utf-8")
+                    file.write(ENTRY.pack(len(encoded_path), mtime, *size))
+                    file.write(encoded_path)
+                    file.write(pixels)
+            os.replace(temp_path, self.cache_path)
+        except OSError:
+            pass
+
+
+def parse_cache(data):
+    """ Return the {path: (mtime, size, rgba bytes)} dictionary from the bytes of a cache file.
+    Raises ValueError (or struct.error) if the data isn't a whole cache file of this version. """
+    magic, version, count = HEADER.unpack_from(data)
+    if magic != CACHE_MAGIC or version != CACHE_VERSION:
+        raise ValueError("not a version {} image cache".format(CACHE_VERSION))
+    cache = {}
+    offset = HEADER.size
+    for _ in range(count):
+        path_length, mtime, width, height = ENTRY.unpack_from(data, offset)
+        offset += ENTRY.size
+        path = data[offset:offset + path_length].decode("utf-8")
+        offset += path_length
+        pixels = data[offset:offset + width * height * 4]
+        if len(pixels) != width * height * 4:
+            raise ValueError("image cache is cut short")
+        offset += len(pixels)
+        cache[path] = (mtime, (width, height), pixels)
+    if offset != len(data):
+        raise ValueError("image cache has extra data")
+    return cache
+
+
+def build_surfaces(decoded):
+    """ Turn a dictionary from Asset_Loader.decode_folder back into surfaces. """
+    images = {}
+    for name, item in decoded.items():
+        if isinstance(item, dict):
+            images[name] = build_surfaces(item)
+        else:
+            size, pixels = item
+            images[name] = pygame.image.fromstring(pixels, size, "RGBA")
+    return images
+
+
+def prepare(images):
+    """ Run the pipeline over a dictionary from build_surfaces.
+    Surfaces are converted to the display format. Folders where every name is a number become a
+    list of frames sorted by that number, so animations are indexed with an int. """
+    prepared = {}
+    for name, item in images.items():
+        if isinstance(item, dict):
+            prepared[name] = prepare(item)
+        else:
+            prepared[name] = item.convert_alpha()
+    for name, item in prepared.items():
+        if isinstance(item, dict) and is_animation(item):
+            prepared[name] = [item[key] for key in sorted(item, key=int)]
+    return prepared
+
+
+def is_animation(images):
+    """ Is this dictionary a folder of numbered frames? """
+    return bool(images) and all(name.isdigit() and not isinstance(item, dict)
+                                for name, item in images.items())
+
+
+def file_name(path):
+    """ Return the name of the folder or item without the full path (or the .png). """
+    name = os.path.basename(path.replace("\\", "/"))
+    if name.lower().endswith(".png"):
+        name = name[:-4]
+    return name
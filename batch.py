@@ -0,0 +1,112 @@
+""" Batch runner - plays lots of headless games with a bot (bot.Bot) over a grid of difficulty values,
+spread over every core with a multiprocessing pool, and saves a row per game to a CSV file.
+Every value of Difficulty can be given as a comma separated list, e.g.
+    python batch.py --runs 8 --spawn_time 1,2,3 --health 24,48 --out sweep.csv
+runs 8 games (seeds seed to seed + 7) for each of the 6 combinations. """
+import argparse
+import csv
+import inspect
+import itertools
+import multiprocessing
+import statistics
+import time
+import bot
+import difficulty
+import headless
+
+# Columns saved for every game, after the difficulty values.
+RESULT_FIELDS = ("seed", "survival_time", "score", "peak_zombies", "ticks", "mean_tick_ms", "p95_tick_ms",
+                 "max_tick_ms")
+
+
+def difficulty_names():
+    """ The names of the Difficulty arguments (in order). """
+    return list(inspect.signature(difficulty.Difficulty).parameters)
+
+
+def play(job):
+    """ Play one game until the player dies or max_time seconds have been simulated.
+    job is (difficulty values dictionary, seed, max_time, dtime). Returns a dictionary for the CSV row. """
+    values, seed, max_time, dtime = job
+    main = headless.Headless_Main(dtime, seed, difficulty.Difficulty(**values))
+    player_bot = bot.Bot()
+    player = main.game.player
+    tick_times = []
+    peak_zombies = 0
+    score = 0
+    for _ in range(int(max_time / dtime)):
+        inputs = player_bot(main)
+        start = time.perf_counter()
+        main.tick(inputs)
+        tick_times.append(time.perf_counter() - start)
+        if main.game.player is not player:  # Died - the game has been reset.
+            break
+        score = main.game.score
+        peak_zombies = max(peak_zombies, len(main.game.zombie_handler.zombies))
+    tick_times.sort()
+    row = dict(values)
+    row.update(seed=seed, survival_time=round(len(tick_times) * dtime, 3), score=score, peak_zombies=peak_zombies,
+               ticks=len(tick_times), mean_tick_ms=round(statistics.fmean(tick_times) * 1000, 4),
+               p95_tick_ms=round(tick_times[int(len(tick_times) * 0.95)] * 1000, 4),
+               max_tick_ms=round(tick_times[-1] * 1000, 4))
+    return row
+
+
+def make_jobs(grid, runs, seed, max_time, dtime):
+    """ Return the jobs for play - runs games (seeds seed, seed + 1...) for every combination in grid
+    (a dictionary of name: list of values). The same seeds are used for every combination. """
+    names = list(grid)
+    return [(dict(zip(names, combination)), seed + run, max_time, dtime)
+            for combination in itertools.product(*(grid[name] for name in names))
+            for run in range(runs)]
+
+
+def run(jobs, out, processes=None):
+    """ Play every job on a process pool (one process per core if processes is None) and save the rows
+    to out (a CSV file path). Returns the rows, in the same order as jobs. """
+    with multiprocessing.Pool(processes) as pool:
+        rows = pool.map(play, jobs, chunksize=1)
+    with open(out, "w", newline="") as file:
+        writer = csv.DictWriter(file, difficulty_names() + list(RESULT_FIELDS))
+        writer.writeheader()
+        writer.writerows({name: row.get(name, "") for name in writer.fieldnames} for row in rows)
+    return rows
+
+
+def summary(rows, names):
+    """ Print the mean survival time, score and peak zombies of every combination of the values in names. """
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(row[name] for name in names), []).append(row)
+    for key, group in groups.items():
+        print("{}: survived {:.1f}s, score {:.1f}, peak zombies {:.1f}, {:.3f}ms/tick ({} games)".format(
+            ", ".join("{}={}".format(*item) for item in zip(names, key)),
+            statistics.fmean(row["survival_time"] for row in group), statistics.fmean(row["score"] for row in group),
+            statistics.fmean(row["peak_zombies"] for row in group),
+            statistics.fmean(row["mean_tick_ms"] for row in group), len(group)))
+
+
+def main():
+    """ Read the command line, run the sweep and print a summary. """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=4, help="games per combination")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--max-time", type=float, default=600, help="most seconds simulated per game")
+    parser.add_argument("--tick-rate", type=float, default=60, help="ticks per second simulated")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default one per core)")
+    parser.add_argument("--out", default="batch.csv", help="CSV file to save the results to")
+    defaults = difficulty.Difficulty().get_values()
+    for name in difficulty_names():
+        parser.add_argument("--" + name, default=str(defaults[name]),
+                            help="comma separated values (default {})".format(defaults[name]))
+    args = parser.parse_args()
+    grid = {name: [float(value) for value in getattr(args, name).split(",")] for name in difficulty_names()}
+    jobs = make_jobs(grid, args.runs, args.seed, args.max_time, 1 / args.tick_rate)
+    start = time.perf_counter()
+    rows = run(jobs, args.out, args.processes)
+    print("{} games in {:.1f}s, saved to {}".format(len(rows), time.perf_counter() - start, args.out))
+    summary(rows, [name for name in grid if len(grid[name]) > 1])
+
+
+if __name__ == "__main__":
+    main()
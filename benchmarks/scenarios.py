@@ -0,0 +1,181 @@
+""" Scenario benchmarks - times the game's update and display separately, tick by tick, in fixed
+(seeded) scenarios with no real window (the SDL dummy driver).
+Reports the median and 99th percentile milliseconds per tick, and can save the results as a baseline
+JSON file and compare later runs against it (slower by more than the threshold is flagged).
+Run from the top folder with:
+    python -m benchmarks.scenarios --save baseline.json
+    python -m benchmarks.scenarios --compare baseline.json """
+# pylint: disable=no-member
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import pygame
+import game
+import input_snapshot
+import projectiles
+import rect
+import settings
+
+SEED = 1234
+# Settings that change what the scenarios measure - saved with the results.
+SETTING_NAMES = ("DIRTY_RECTS", "RENDER_WIDTH", "ARRAY_ZOMBIES", "ZOMBIE_SEPARATION", "FLOW_FIELD", "AI_SCHEDULER",
+                 "TICK_RATE")
+
+
+class Scenario:
+    """ A fixed situation to time.
+    zombies - how many zombies (spread over the screen, no more spawn).
+    window - window size in pixels.
+    fire - None, "pistol" (click every tick) or "pdw" (hold the mouse down).
+    paused - is the game paused (the pause screen)? """
+    def __init__(self, name, zombies=100, window=(800, 600), fire=None, paused=False):
+        self.name = name
+        self.zombies = zombies
+        self.window = window
+        self.fire = fire
+        self.paused = paused
+
+    def available(self):
+        """ Can this scenario run here? (The PDW needs projectiles, which need NumPy.) """
+        return self.fire != "pdw" or projectiles.available()
+
+    def set_up(self):
+        """ Return a main.Main with the scenario's game ready to run. """
+        import main as main_module  # Not at the top - pygame has to be started first.
+        main = main_module.Main()
+        main_module.main = main
+        main.startup_time = 0  # Don't print the startup time.
+        main.set_window(rect.Size(*self.window))
+        main.game = game.Game(grab_input=False, seed=SEED)
+        game_state = main.game
+        game_state.update_score_font(main)
+        game_state.player.max_health = game_state.player.health = 1e12  # Never dies.
+        handler = game_state.zombie_handler
+        handler.time_until_spawn = 1e12  # Only the zombies added here.
+        for _ in range(self.zombies):
+            new_zombie = handler.pool.acquire(main)
+            new_zombie.pos.set(game_state.rng.random(), game_state.rng.random())
+            new_zombie.save_pos()
+            new_zombie.max_health = new_zombie.health = 1e12  # Shots don't change the number of zombies.
+            handler.add(new_zombie)
+        handler.update_grid()
+        if self.fire == "pdw":
+            game_state.player.gun = game_state.player.guns[1]
+        game_state.pause = self.paused
+        return main
+
+    def inputs(self):
+        """ The Input_Snapshot for every tick - aiming right, firing if self.fire. """
+        aim = rect.Vec2(1, 0.5)
+        if self.fire == "pistol":
+            return input_snapshot.Input_Snapshot((), (), 1, False, aim)
+        return input_snapshot.Input_Snapshot((), (), 0, self.fire == "pdw", aim)
+
+    def run(self, ticks, dtime=1 / 60):
+        """ Run ticks ticks, returning (update times, display times) in seconds. """
+        main = self.set_up()
+        main.dtime = dtime
+        main.interpolation = 1
+        inputs = self.inputs()
+        update_times = []
+        display_times = []
+        for _ in range(ticks):
+            start = time.perf_counter()
+            main.game.update_game(main, inputs)
+            middle = time.perf_counter()
+            main.game.update_display(main)
+            main.display_game()
+            end = time.perf_counter()
+            update_times.append(middle - start)
+            display_times.append(end - middle)
+        return update_times, display_times
+
+
+SCENARIOS = [
+    Scenario("zombies_10", 10),
+    Scenario("zombies_100", 100),
+    Scenario("zombies_1000", 1000),
+    Scenario("zombies_10000", 10000),
+    Scenario("fire_pistol", 100, fire="pistol"),
+    Scenario("fire_pdw", 100, fire="pdw"),
+    Scenario("paused", 100, paused=True),
+    Scenario("window_400", 100, window=(400, 400)),
+    Scenario("window_1280", 100, window=(1280, 720)),
+    Scenario("window_1920", 100, window=(1920, 1080)),
+]
+
+
+def percentile(times, fraction):
+    """ The fraction (0 to 1) percentile of times, in milliseconds. """
+    ordered = sorted(times)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+
+def summarise(update_times, display_times):
+    """ Return the result dictionary for one scenario. """
+    return {"update_median": statistics.median(update_times) * 1000, "update_p99": percentile(update_times, 0.99),
+            "display_median": statistics.median(display_times) * 1000,
+            "display_p99": percentile(display_times, 0.99)}
+
+
+def compare(results, baseline, threshold):
+    """ Return a list of (scenario, measure, baseline ms, new ms) that are more than threshold (a fraction)
+    slower than baseline. Scenarios not in the baseline are skipped. """
+    slower = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        for measure, value in result.items():
+            if measure in old and value > old[measure] * (1 + threshold):
+                slower.append((name, measure, old[measure], value))
+    return slower
+
+
+def main():
+    """ Read the command line, run the scenarios, print a table and save or compare the results.
+    Exits with 1 if anything got slower than the baseline. """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=300, help="ticks timed per scenario")
+    parser.add_argument("--only", default="", help="comma separated scenario names (default all)")
+    parser.add_argument("--save", help="save the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare the results to")
+    parser.add_argument("--threshold", type=float, default=0.1, help="fraction slower that counts as a regression")
+    args = parser.parse_args()
+    only = set(filter(None, args.only.split(",")))
+
+    results = {}
+    print("{:<16}{:>14}{:>12}{:>15}{:>13}".format("scenario", "update median", "update p99", "display median",
+                                                  "display p99"))
+    for scenario in SCENARIOS:
+        if (only and scenario.name not in only) or not scenario.available():
+            continue
+        result = summarise(*scenario.run(args.ticks))
+        results[scenario.name] = result
+        print("{:<16}{:>14.3f}{:>12.3f}{:>15.3f}{:>13.3f}".format(
+            scenario.name, result["update_median"], result["update_p99"], result["display_median"],
+            result["display_p99"]))
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({"settings": {name: getattr(settings, name) for name in SETTING_NAMES},
+                       "ticks": args.ticks, "results": results}, file, indent=2)
+        print("Saved to", args.save)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        slower = compare(results, baseline["results"], args.threshold)
+        for name, measure, old, new in slower:
+            print("REGRESSION {} {}: {:.3f}ms -> {:.3f}ms ({:+.0%})".format(name, measure, old, new, new / old - 1))
+        if slower:
+            sys.exit(1)
+        print("No regressions against", args.compare)
+
+
+if __name__ == "__main__":
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    pygame.init()
+    main()
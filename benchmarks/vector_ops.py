@@ -0,0 +1,66 @@
+""" Micro-benchmark of rect.Pos against rect.Vec2 for the operations the game does every frame.
+Run from the top folder with: python -m benchmarks.vector_ops [repeats] """
+import sys
+import timeit
+import rect
+
+
+class Fake_Main:
+    """ Just enough of main for scale_for_window. """
+    game_window_width = 800
+
+
+class Fake_Character:
+    """ Just a pos. """
+    def __init__(self, pos):
+        self.pos = pos
+
+
+def operations(vector_class):
+    """ Return a dictionary of name: function that does the operation once with vector_class. """
+    main = Fake_Main()
+    first = vector_class(0.3, 0.4)
+    second = vector_class(0.6, 0.2)
+    out = vector_class(0, 0)
+    holder = Fake_Character(second)  # Pos.distance takes something with a .pos
+
+    def copy():
+        first.copy()
+
+    def rotate_around():
+        if vector_class is rect.Vec2:
+            out.set_from(first).rotate_around(second, 0.5)
+        else:
+            point = first.copy()
+            point.rotate_around(second, 0.5)
+
+    def distance():
+        if vector_class is rect.Vec2:
+            first.distance(second)
+        else:
+            first.distance(holder)
+
+    def scale_for_window():
+        first.scale_for_window(main)
+
+    def get_rounded_values():
+        tuple(first.get_rounded_values())
+
+    return {"copy": copy, "rotate_around": rotate_around, "distance": distance,
+            "scale_for_window": scale_for_window, "get_rounded_values": get_rounded_values}
+
+
+def run(repeats=200000):
+    """ Time each operation for both classes and print a table of nanoseconds per call. """
+    pos_operations = operations(rect.Pos)
+    vec_operations = operations(rect.Vec2)
+    print("{:<20}{:>12}{:>12}{:>10}".format("operation", "Pos ns", "Vec2 ns", "speedup"))
+    for name in pos_operations:
+        pos_time = min(timeit.repeat(pos_operations[name], number=repeats, repeat=5)) / repeats
+        vec_time = min(timeit.repeat(vec_operations[name], number=repeats, repeat=5)) / repeats
+        print("{:<20}{:>12.0f}{:>12.0f}{:>9.2f}x".format(name, pos_time * 1e9, vec_time * 1e9,
+                                                          pos_time / vec_time))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
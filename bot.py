@@ -0,0 +1,64 @@
+""" Bot object - a scripted player for headless games (see headless.py and batch.py).
+It aims at the nearest zombie, shoots at it every so often and backs away from zombies that get close,
+keeping towards the middle of the screen so it doesn't get stuck in a corner. """
+# pylint: disable=no-member
+import pygame
+import input_snapshot
+import rect
+
+
+class Bot:
+    """ Call with main to get the Input_Snapshot for the next tick.
+    shot_delay - seconds between shots (like a reaction time).
+    flee_distance - zombies closer than this (screen widths) are backed away from. """
+    def __init__(self, shot_delay=0.15, flee_distance=0.2, centre_pull=2):
+        self.shot_delay = shot_delay
+        self.flee_distance = flee_distance
+        self.centre_pull = centre_pull  # How strongly the bot heads back to the middle of the screen.
+        self.shot_cool_down = 0
+
+    def nearest_zombie(self, main):
+        """ Return (zombie, distance) of the zombie nearest the player, or (None, None) if there aren't any. """
+        zombies = main.game.zombie_handler.zombies
+        if not zombies:
+            return None, None
+        zombie_distances = rect.distances([zombie.pos for zombie in zombies], main.game.player.pos)
+        nearest_distance = min(zombie_distances)
+        return zombies[zombie_distances.index(nearest_distance)], nearest_distance
+
+    def movement_keys(self, main, zombie, distance):
+        """ Return the keys to hold - away from zombie if it's within self.flee_distance, and towards the middle. """
+        pos = main.game.player.pos
+        move_x = (0.5 - pos.x) * self.centre_pull
+        move_y = (0.5 - pos.y) * self.centre_pull
+        if zombie is not None and 0 < distance < self.flee_distance:
+            zombie_pos = zombie.pos
+            push = (self.flee_distance - distance) / (self.flee_distance * distance)
+            move_x += (pos.x - zombie_pos.x) * push
+            move_y += (pos.y - zombie_pos.y) * push
+        keys = []
+        if move_x > 0.1:
+            keys.append(pygame.K_d)
+        elif move_x < -0.1:
+            keys.append(pygame.K_a)
+        if move_y > 0.1:
+            keys.append(pygame.K_s)
+        elif move_y < -0.1:
+            keys.append(pygame.K_w)
+        return keys
+
+    def __call__(self, main):
+        """ Return the Input_Snapshot for this tick. """
+        self.shot_cool_down = max(0, self.shot_cool_down - main.dtime)
+        zombie, distance = self.nearest_zombie(main)
+        keys = self.movement_keys(main, zombie, distance)
+        if zombie is None:
+            return input_snapshot.Input_Snapshot(keys)
+        zombie_pos = zombie.pos
+        aim = rect.Vec2(zombie_pos.x, zombie_pos.y)
+        on_screen = 0 < zombie_pos.x < 1 and 0 < zombie_pos.y < 1
+        clicks = 0
+        if on_screen and not self.shot_cool_down:
+            clicks = 1
+            self.shot_cool_down = self.shot_delay
+        return input_snapshot.Input_Snapshot(keys, (), clicks, on_screen, aim)
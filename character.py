@@ -1,40 +1,62 @@
 """ Base character object - only to be used as a parent class. """
 import pygame
-import math
 import rect
+import render_queue
 
 
 class Character:
     """ Base character object - only to be used as a parent class. """
+    __slots__ = ("radius", "pos", "previous_pos", "rotation", "max_health", "health")
+
     def __init__(self):
         self.radius = 0.05
-        self.pos = rect.Pos(0.5, 0.5)
+        self.pos = rect.Vec2(0.5, 0.5)
+        self.previous_pos = self.pos.copy()  # Where it was at the start of the last tick.
         self.rotation = 0
         self.max_health = 10
         self.health = self.max_health
 
     def show_hit_circle(self, main, color=(0, 255, 0)):
         """ Show the hit circle - just a circle at self.pos with self.radius. """
-        pos = self.pos.scale_for_window(main)
-        pygame.draw.circle(main.game_window, color, pos, int(self.radius * main.game_window_width))
+        x, y = self.draw_pos(main)
+        pos = round(x * main.game_window_width), round(y * main.game_window_width)
+        main.render_queue.add_draw(render_queue.HUD, pygame.draw.circle, color, pos,
+                                   int(self.radius * main.game_window_width))
 
-    def show_image(self, image, main):
+    def show_image(self, image, main, rotation=None, layer=render_queue.BODY, texture=None):
         """ Show the image but scale and rotate it correctly.
         The image is scaled so the mean of the dimentions is self.radius.
-        The image is rotated to self.rotation.
-        Placed on self.pos. """
-        image_size = rect.Size(pygame_rect=image.get_rect())
-        avg_side = image_size.w + image_size.h
-        scale = (self.radius / avg_side) * main.game_window_width * 4
-        image_size.scale_up(w_scale=scale, h_scale=scale)
-        scaled_image = pygame.transform.scale(image, image_size.get_rounded_values())
-        rotated_image = pygame.transform.rotate(scaled_image, -math.degrees(self.rotation))
-        rotated_rect = rect.Size(pygame_rect=rotated_image.get_rect())
-        pos = self.pos.copy()
-        pos.scale_up(x_scale=main.game_window_width, y_scale=main.game_window_width)
-        pos.x -= rotated_rect.w / 2
-        pos.y -= rotated_rect.h / 2
-        main.game_window.blit(rotated_image, pos.get_rounded_values())
+        The image is rotated to self.rotation (or rotation if it's given).
+        The transformed image comes from main.sprite_cache.
+        Placed on self.pos (queued in layer of main.render_queue, sorted by texture - image if it's None). """
+        width, height = image.get_size()
+        scale = (self.radius / (width + height)) * main.game_window_width * 4
+        if rotation is None:
+            rotation = self.rotation
+        rotated_image = main.sprite_cache.get(image, rotation, (round(width * scale), round(height * scale)))
+        rotated_width, rotated_height = rotated_image.get_size()
+        x, y = self.draw_pos(main)
+        main.render_queue.add_blit(layer, rotated_image,
+                                   (round(x * main.game_window_width - rotated_width / 2),
+                                    round(y * main.game_window_width - rotated_height / 2)),
+                                   main.sprite_cache.texture(image if texture is None else texture))
+
+    def save_pos(self):
+        """ Remember the position at the start of a tick (for draw_pos). """
+        self.previous_pos.set_from(self.pos)
+
+    def draw_pos(self, main):
+        """ Return the (x, y) to draw the character at - main.interpolation of the way from where it
+        was at the start of the last tick to where it is now. """
+        previous = self.previous_pos
+        alpha = main.interpolation
+        return previous.x + (self.pos.x - previous.x) * alpha, previous.y + (self.pos.y - previous.y) * alpha
+
+    def is_on_screen(self, margin=2.5):
+        """ Could any of the character (image, shadow or health bar) be on the game window?
+        Everything drawn for a character is within margin * self.radius of self.pos. """
+        reach = self.radius * margin
+        return -reach < self.pos.x < 1 + reach and -reach < self.pos.y < 1 + reach
 
     def keep_on_screen(self):
         """ Make sure the player does not go off the screen - set boundaries on the position. """
@@ -42,22 +64,10 @@ class Character:
         self.pos.y = max(min(1 - self.radius, self.pos.y), self.radius)
 
     def show_shadow(self, main):
-        """ Show a black circle. """
-        pos = self.pos.scale_for_window(main)
-        radius = int(self.radius * main.game_window_width * 0.8)
-        shadow_surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(shadow_surf, (0, 0, 0, 100), (radius, radius), radius)
-        main.game_window.blit(shadow_surf, (pos[0] - radius, pos[1] - radius))
-
-    def show_health_bar(self, main):
-        """ Show a little health bar above the characters head.
-        Gets values from self.max_health and self.health. """
-        bar_width = self.radius * 2
-        bar_height = bar_width * 0.2
-        health_per = max(self.health, 0) / self.max_health
-        bar_pos = rect.Pos(self.pos.x - bar_width / 2, self.pos.y - self.radius - bar_height * 2)
-        bar_pos = bar_pos.scale_for_window(main)
-        bar_width *= main.game_window_width
-        bar_height *= main.game_window_width
-        pygame.draw.rect(main.game_window, (200, 0, 0), (bar_pos[0], bar_pos[1], bar_width, bar_height))
-        pygame.draw.rect(main.game_window, (0, 200, 0), (bar_pos[0], bar_pos[1], bar_width * health_per, bar_height))
+        """ Show a black circle (a shared stamp from main.overlay). """
+        main.overlay.show_shadow(main, self)
+
+    def show_health_bar(self, main, hide_full_health=False):
+        """ Add a little health bar above the characters head to main.overlay (not at full health if
+        hide_full_health). The bars are drawn together in the HUD layer of main.render_queue. """
+        main.overlay.add_health_bar(main, self, hide_full_health)
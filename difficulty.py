@@ -0,0 +1,43 @@
+""" Difficulty object - how zombies spawn and how tough they are as the score goes up.
+The defaults are the difficulty the game has always had; batch.py runs games with other values. """
+
+
+class Difficulty:
+    """ The difficulty curve. Every value is a number (int or float).
+    Seconds between spawns: spawn_time / (score / spawn_score + 1).
+    Zombie speed: min(velocity + score / velocity_score, max_velocity) screen widths per second.
+    Zombie health: health * (1 + score / health_score). """
+    # pylint: disable=too-many-arguments
+    def __init__(self, spawn_time=2, spawn_score=50, velocity=0.1, velocity_score=1000, max_velocity=3,
+                 health=24, health_score=5):
+        self.spawn_time = spawn_time
+        self.spawn_score = spawn_score
+        self.velocity = velocity
+        self.velocity_score = velocity_score
+        self.max_velocity = max_velocity
+        self.health = health
+        self.health_score = health_score
+
+    def time_between_spawns(self, score):
+        """ Seconds between zombies spawning at score. """
+        return self.spawn_time / (score / self.spawn_score + 1)
+
+    def zombie_velocity(self, score):
+        """ Speed of a zombie spawned at score. """
+        return min(self.velocity + score / self.velocity_score, self.max_velocity)
+
+    def zombie_health(self, score):
+        """ Health of a zombie spawned at score. """
+        return self.health * (1 + score / self.health_score)
+
+    def get_values(self):
+        """ Return a dictionary of the values (the arguments to make the same Difficulty). """
+        return dict(vars(self))
+
+    def __str__(self):
+        """ return string in format "Difficulty(name=value, ...)". """
+        return "Difficulty({})".format(", ".join("{}={}".format(*item) for item in self.get_values().items()))
+
+    def __repr__(self):
+        """ Just return __str__ result. """
+        return self.__str__()
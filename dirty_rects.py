@@ -0,0 +1,79 @@
+""" Dirty_Rects object - for the dirty rectangle rendering mode.
+Remembers where things were drawn last frame, so only those parts of the game window are cleared,
+and only the changed parts of the window are sent to pygame.display.update. """
+import pygame
+
+
+class Dirty_Rects:
+    """ Tracks the changed rectangles of the game window and the HUD. """
+    def __init__(self, enabled=False, max_rects=300):
+        self.enabled = enabled
+        self.max_rects = max_rects  # Any more than this and the whole window is updated instead.
+        self.full_redraw = True  # Set when everything has changed (first frame, resize, pause).
+        self.game_rects = []  # Drawn this frame, game window coordinates.
+        self.last_game_rects = []
+        self.last_hud_rects = []  # Full window coordinates.
+        self.paused = False  # Has the (static) pause screen been shown?
+
+    def is_static(self, main):
+        """ Is the pause screen already showing? Then nothing needs to be drawn at all. """
+        return main.game.pause and self.paused and not self.full_redraw
+
+    def restore_background(self, surface, color):
+        """ Clear the game window under everything that was drawn last frame. """
+        if self.full_redraw:
+            surface.fill(color)
+            return
+        for dirty_rect in self.last_game_rects:
+            surface.fill(color, dirty_rect)
+
+    def add_game_rects(self, rects):
+        """ Add the rectangles that have been drawn on the game window this frame. """
+        self.game_rects.extend(rects)
+
+    def present(self, main, background):
+        """ Copy the changed parts of the game window to the main window, redraw the HUD there and
+        update only those rectangles of the display. """
+        if main.game.pause != self.paused:
+            self.full_redraw = True
+        if self.full_redraw or len(self.game_rects) + len(self.last_game_rects) > self.max_rects:
+            main.full_window.fill(background)
+            main.full_window.blit(main.displayed_game_window(), main.game_window_offset.get_rounded_values())
+            self.last_hud_rects = self.show_hud(main)
+            pygame.display.update()
+        else:
+            offset = main.game_window_offset.get_rounded_values()
+            game_window = main.displayed_game_window()
+            game_area = game_window.get_rect()
+            scale = main.display_width / main.game_window_width
+            rects = [self.to_window(dirty_rect, scale, offset)
+                     for dirty_rect in self.game_rects + self.last_game_rects]
+            rects.extend(self.last_hud_rects)
+            for dirty_rect in rects:
+                main.full_window.fill(background, dirty_rect)
+                area = dirty_rect.move(-offset[0], -offset[1]).clip(game_area)
+                if area.w and area.h:
+                    main.full_window.blit(game_window, area.move(offset), area)
+            self.last_hud_rects = self.show_hud(main)
+            pygame.display.update(rects + self.last_hud_rects)
+        self.paused = main.game.pause
+        self.full_redraw = False
+        self.last_game_rects = self.game_rects
+        self.game_rects = []
+
+    @staticmethod
+    def to_window(dirty_rect, scale, offset):
+        """ Convert a rectangle on the game window to the main window (scaled by scale and moved by offset).
+        Scaled rectangles are grown by a pixel to cover rounding. """
+        if scale == 1:
+            return dirty_rect.move(offset)
+        return pygame.Rect(int(dirty_rect.x * scale) + offset[0] - 1, int(dirty_rect.y * scale) + offset[1] - 1,
+                           int(dirty_rect.w * scale) + 3, int(dirty_rect.h * scale) + 3)
+
+    def show_hud(self, main):
+        """ Draw the HUD on the main window, return the rectangles it covers. """
+        hud_rects = [main.game.show_score(main), main.game.show_clip(main)]
+        if main.game.pause:
+            main.game.pause_func(main)
+        hud_rects.extend(main.profiler.show(main))
+        return hud_rects
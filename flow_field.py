@@ -0,0 +1,122 @@
+""" Flow_Field object - one shared path finding field towards the player.
+The play area is split into a grid of cells. Whenever the player moves into a new cell, the cost to
+reach the player is worked out for every cell at once (Dijkstra), and each cell points at its
+cheapest neighbour. Zombies then just look up the direction for the cell they're in. """
+import heapq
+import math
+import pygame
+import render_queue
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, it's only used to look up lots of zombies at once.
+    numpy = None
+
+NEIGHBOURS = [(d_column, d_row, math.hypot(d_column, d_row))
+              for d_column in (-1, 0, 1) for d_row in (-1, 0, 1) if d_column or d_row]
+
+
+class Flow_Field:
+    """ Directions towards a target over a columns by columns grid covering the play area.
+    obstacles is a list of (column, row) cells that can't be walked through. """
+    def __init__(self, columns=32, obstacles=()):
+        self.columns = columns
+        self.cell_size = 1 / columns
+        self.obstacles = set(obstacles)
+        self.target_cell = None
+        self.costs = []
+        # Angle (radians) to move in for each cell, by row then column. None means head straight for the
+        # target (the target's cell, the cells next to it, and cells that can't reach it).
+        self.angles = [[None] * columns for _ in range(columns)]
+        self.angle_array = None  # self.angles as a NumPy array (None is nan) if NumPy is installed.
+        self.builds = 0
+
+    def cell(self, x, y):
+        """ Return the (column, row) that x, y is in. Positions off the grid use the nearest edge cell. """
+        last = self.columns - 1
+        return (min(last, max(0, int(x * self.columns))), min(last, max(0, int(y * self.columns))))
+
+    def update(self, target_x, target_y):
+        """ Rebuild the field if the target has moved into a different cell. """
+        target_cell = self.cell(target_x, target_y)
+        if target_cell != self.target_cell:
+            self.target_cell = target_cell
+            self.build()
+
+    def build(self):
+        """ Work out the cost from every cell to self.target_cell, then the direction for every cell. """
+        columns = self.columns
+        costs = [[math.inf] * columns for _ in range(columns)]
+        target_column, target_row = self.target_cell
+        costs[target_row][target_column] = 0
+        queue = [(0, target_column, target_row)]
+        while queue:
+            cost, column, row = heapq.heappop(queue)
+            if cost > costs[row][column]:
+                continue
+            for d_column, d_row, step in NEIGHBOURS:
+                next_column = column + d_column
+                next_row = row + d_row
+                if not (0 <= next_column < columns and 0 <= next_row < columns):
+                    continue
+                if not self.can_step(column, row, d_column, d_row):
+                    continue
+                if cost + step < costs[next_row][next_column]:
+                    costs[next_row][next_column] = cost + step
+                    heapq.heappush(queue, (cost + step, next_column, next_row))
+        self.costs = costs
+        for row in range(columns):
+            for column in range(columns):
+                self.angles[row][column] = self.best_angle(column, row)
+        if numpy is not None:
+            self.angle_array = numpy.array([[numpy.nan if angle is None else angle for angle in angles]
+                                            for angles in self.angles])
+        self.builds += 1
+
+    def can_step(self, column, row, d_column, d_row):
+        """ Can something move from a cell to the neighbouring cell (d_column, d_row) away?
+        Diagonal steps can't cut the corner of an obstacle. """
+        if (column + d_column, row + d_row) in self.obstacles:
+            return False
+        if d_column and d_row:
+            return (column + d_column, row) not in self.obstacles and (column, row + d_row) not in self.obstacles
+        return True
+
+    def best_angle(self, column, row):
+        """ Angle from a cell to its cheapest neighbour, or None if it should head straight for the target. """
+        best = None
+        best_cost = self.costs[row][column]
+        if best_cost == math.inf:
+            return None
+        for d_column, d_row, step in NEIGHBOURS:
+            next_column = column + d_column
+            next_row = row + d_row
+            if not (0 <= next_column < self.columns and 0 <= next_row < self.columns):
+                continue
+            if not self.can_step(column, row, d_column, d_row):
+                continue
+            if self.costs[next_row][next_column] + step <= best_cost + 1e-9:
+                best_cost = self.costs[next_row][next_column] + step
+                best = (next_column, next_row)
+        if best is None or best == self.target_cell:
+            return None
+        return math.atan2(best[1] - row, best[0] - column)
+
+    def angle(self, x, y):
+        """ Angle to move in from x, y (or None to head straight for the target). """
+        column, row = self.cell(x, y)
+        return self.angles[row][column]
+
+    def angles_at(self, xs, ys):
+        """ NumPy version of angle for arrays of positions - nan where it should head straight for the target. """
+        last = self.columns - 1
+        columns = numpy.clip((xs * self.columns).astype(int), 0, last)
+        rows = numpy.clip((ys * self.columns).astype(int), 0, last)
+        return self.angle_array[rows, columns]
+
+    def show(self, main):
+        """ Queue the obstacle cells (under everything else). """
+        size = self.cell_size * main.game_window_width
+        for column, row in self.obstacles:
+            main.render_queue.add_draw(render_queue.SHOT, pygame.Surface.fill, (90, 90, 90),
+                                       (round(column * size), round(row * size), math.ceil(size), math.ceil(size)))
@@ -1,63 +1,111 @@
 """ Game object, controls all the game things. """
+import random
 import pygame
+import difficulty
+import flow_field
 import player
+import projectiles
 import shot_handler
 import zombie
+import zombie_store
 import rect
+import settings
 
 
 class Game:
     """ Main game object, contains all the updating and showing functions. """
-    def __init__(self):
+    def __init__(self, grab_input=True, seed=None, difficulty_curve=None):
         """ Initialize all the objects: Player, Zombie (and handler),
-        Lock the input to the game. """
+        Lock the input to the game (unless grab_input is False - e.g. there's no window).
+        All the game's randomness comes from self.rng, seeded with seed (a random seed if it's None),
+        so the same seed and input give the same game.
+        difficulty_curve is a difficulty.Difficulty (the normal one if it's None). """
+        self.grab_input = grab_input
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.difficulty = difficulty_curve if difficulty_curve is not None else difficulty.Difficulty()
+        self.recorder = None  # A recording.Recorder to save the input of every tick to.
         self.player = None
         self.shot_handler = None
+        self.projectile_handler = None
+        self.flow_field = None
+        if settings.FLOW_FIELD:
+            self.flow_field = flow_field.Flow_Field(settings.FLOW_FIELD_COLUMNS, settings.OBSTACLES)
         self.reset_objects()
-        pygame.event.set_grab(True)
+        self.set_grab(True)
         self.pause = False
         self.score_font = None
+        self.time = 0  # Seconds simulated (not counting time paused) - the clock for gameplay timers.
 
     def reset_objects(self):
-        """ (Re)set all the objects used in the game: the Player, Zombie (and handler) """
+        """ (Re)set all the objects used in the game: the Player, Zombie (and handler), shot and
+        projectile handlers (projectiles need NumPy) """
         self.player = player.Player()
         self.shot_handler = shot_handler.Shot_Handler()
-        self.zombie_handler = zombie.Zombie_Handler()
+        self.projectile_handler = projectiles.Projectile_Handler() if projectiles.available() else None
+        if settings.ARRAY_ZOMBIES and zombie_store.available():
+            self.zombie_handler = zombie_store.Array_Zombie_Handler()
+        else:
+            self.zombie_handler = zombie.Zombie_Handler()
         self.score = 0
 
-    def update_frame(self, main):
-        """ Update everything. """
-        self.player.update(main)
-        self.shot_handler.update(main)
-        self.zombie_handler.update(main)
+    def update_frame(self, main, inputs):
+        """ Update everything for one tick of inputs (an Input_Snapshot).
+        Only reads main.dtime, main.game and main.profiler, so it doesn't need a window. """
+        self.time += main.dtime
+        self.save_positions()
+        profiler = main.profiler
+        profiler.measure("player.update", self.player.update, main, inputs)
+        if self.flow_field is not None:
+            profiler.measure("flow_field.update", self.flow_field.update, self.player.pos.x, self.player.pos.y)
+        profiler.measure("shots.update", self.shot_handler.update, main)
+        if self.projectile_handler is not None:
+            profiler.measure("projectiles.update", self.projectile_handler.update, main)
+        profiler.measure("zombies.update", self.zombie_handler.update, main)
 
         if self.player.health <= 0:
             self.reset_objects()
 
-    def update_game(self, main):
-        """ Run the game. """
+    def update_game(self, main, inputs):
+        """ Run the game for one tick of inputs (an Input_Snapshot), pausing when escape is tapped. """
+        if self.recorder is not None:
+            self.recorder.write(inputs, main.dtime)
         if not self.pause:
-            self.update_frame(main)
-            if main.is_tapped(pygame.K_ESCAPE):
+            self.update_frame(main, inputs)
+            if inputs.is_tapped(pygame.K_ESCAPE):
                 self.pause = True
-                pygame.event.set_grab(False)
+                self.set_grab(False)
         else:
-            pygame.event.set_grab(False)
-            if main.is_tapped(pygame.K_ESCAPE):
+            self.save_positions()  # Nothing moves, so nothing should be drawn between positions.
+            self.set_grab(False)
+            if inputs.is_tapped(pygame.K_ESCAPE):
                 self.pause = False
-                pygame.event.set_grab(True)
+                self.set_grab(True)
+
+    def save_positions(self):
+        """ Remember where the characters are at the start of a tick (see Character.draw_pos). """
+        self.player.save_pos()
+        self.zombie_handler.save_positions()
+
+    def set_grab(self, grab):
+        """ Lock (or unlock) the input to the game window, if self.grab_input. """
+        if self.grab_input:
+            pygame.event.set_grab(grab)
 
     def show_score(self, main):
-        """ Show the score (zombies killed) in the top right. """
+        """ Show the score (zombies killed) in the top right.
+        The text is only rendered again when the score changes (main.hud).
+        Returns the rectangle of the window that was drawn on. """
         if not self.score_font:
             self.update_score_font(main)
-        text_surf = self.score_font.render("Score: {}".format(self.score * 10), True, (0, 0, 0))
-        margin = main.game_window_width // 50
-        main.full_window.blit(text_surf, (margin, margin))
+        text_surf = main.hud.text("score", "Score: {}".format(self.score * 10), self.score_font)
+        margin = main.display_width // 50
+        return main.full_window.blit(text_surf, (margin, margin))
 
     def show_clip(self, main):
-        """ Show a bar in the top right of the screen, representing bullets in the gun. """
-        bar_height = main.game_window_width // 20
+        """ Show a bar in the top right of the screen, representing bullets in the gun.
+        Returns the rectangle of the window that was drawn on. """
+        bar_height = main.display_width // 20
         bar_width = bar_height * 5
         clip_per = max(self.player.gun.clip, 0) / self.player.gun.clip_size
         bar_pos = rect.Pos(main.full_window_size.w - bar_width - bar_height * (2/5), bar_height * (2/5))
@@ -65,40 +113,54 @@ class Game:
             bar_fill = bar_width - bar_width * (self.player.gun.reloading / self.player.gun.reload_time)
         else:
             bar_fill = bar_width * clip_per
-        pygame.draw.rect(main.full_window, (0, 0, 0),
-                         (bar_pos.x, bar_pos.y, bar_width, bar_height))
-        pygame.draw.rect(main.full_window, (150, 150, 150),
-                         (bar_pos.x, bar_pos.y, round(bar_fill), bar_height))
+        bar_rect = main.full_window.blit(main.hud.clip_bar((bar_width, bar_height)),
+                                         bar_pos.get_rounded_values())
+        main.full_window.fill((150, 150, 150), (bar_rect.x, bar_rect.y, round(bar_fill), bar_height))
+        return bar_rect
 
     def update_score_font(self, main):
         """ Called when window size changes.
-        Updates the font (size) for the score counter. """
-        size = main.game_window_width // 20
-        self.score_font = pygame.font.SysFont('Courier New', size)
+        Updates the font (size) for the score counter - fonts are cached by size in main.hud. """
+        size = main.display_width // 20
+        self.score_font = main.hud.font(size)
 
     def update_display(self, main):
-        """ Completely update the display - Clear the screen, show items, update window. """
+        """ Completely update the display - Clear the screen, show items, update window.
+        The show methods queue their drawing on main.render_queue, which is flushed at the end. """
         # background = pygame.transform.scale(main.images["background"], (main.game_window_width,) * 2)
         # main.game_window.blit(background, (0, 0))
-        main.game_window.fill((202, 200, 200))
-        self.shot_handler.show(main)
-        self.player.show(main)
-        self.zombie_handler.show(main)
+        if main.dirty_rects.enabled:
+            if main.dirty_rects.is_static(main):
+                return
+            main.dirty_rects.restore_background(main.game_window, (202, 200, 200))
+        else:
+            main.game_window.fill((202, 200, 200))
+        profiler = main.profiler
+        if self.flow_field is not None:
+            profiler.measure("flow_field.show", self.flow_field.show, main)
+        profiler.measure("shots.show", self.shot_handler.show, main)
+        if self.projectile_handler is not None:
+            profiler.measure("projectiles.show", self.projectile_handler.show, main)
+        profiler.measure("player.show", self.player.show, main)
+        profiler.measure("zombies.show", self.zombie_handler.show, main)
+        profiler.measure("render_queue.flush", main.render_queue.flush, main.game_window)
+        if main.dirty_rects.enabled:
+            main.dirty_rects.add_game_rects(main.render_queue.drawn_rects)
 
     def pause_func(self, main):
-        """ Called when escape is pressed. """
-        window_size = main.full_window_size.get_values()
-        background = pygame.Surface(window_size)
-        pygame.draw.rect(background, (255, 255, 255), (0, 0, window_size[0], window_size[1]))
-        background.set_alpha(128)
-        main.full_window.blit(background, (0, 0))
+        """ Called when escape is pressed. Covers the window with the (cached) pause veil. """
+        main.full_window.blit(main.hud.pause_veil(main.full_window_size.get_values()), (0, 0))
 
     def mouse_pos(self, main, scale_down=False):
-        """ Get the mouse position on the game window. """
+        """ Get the mouse position on the game window (in game window pixels, or 0 to 1 if scale_down).
+        Accounts for the game window being drawn at a different size to how it's shown. """
         mouse_pos_tup = pygame.mouse.get_pos()
-        mouse_pos = rect.Pos(mouse_pos_tup[0], mouse_pos_tup[1])
+        mouse_pos = rect.Vec2(mouse_pos_tup[0], mouse_pos_tup[1])
         mouse_pos.x -= main.game_window_offset.x
         mouse_pos.y -= main.game_window_offset.y
+        if main.display_width != main.game_window_width:
+            mouse_pos.scale_up(main.game_window_width / main.display_width,
+                               main.game_window_width / main.display_width)
         if scale_down:
             mouse_pos.x /= main.game_window_width
             mouse_pos.y /= main.game_window_width
@@ -0,0 +1,54 @@
+""" Runs the game simulation without a window.
+Headless_Main stands in for main.Main - it only has what Game.update_game reads (dtime and game) -
+and pygame uses the SDL dummy video driver, so nothing is ever shown.
+Input comes from a controller function instead of the keyboard and mouse.
+Run from the top folder with: python headless.py [ticks] """
+# pylint: disable=no-member
+import os
+import sys
+import time
+import pygame
+import game
+import input_snapshot
+import profiler
+
+
+def init():
+    """ Start pygame with the dummy video driver (no window).
+    SDL is told not to catch SIGINT and SIGTERM, so headless processes can still be stopped (batch.py's
+    worker processes are terminated with SIGTERM).
+    Must be called before pygame.init for the driver to take effect. """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_NO_SIGNAL_HANDLERS"] = "1"
+    pygame.init()
+
+
+class Headless_Main:
+    """ The parts of main.Main the simulation uses, with a fixed time step. """
+    def __init__(self, dtime=1 / 60, seed=None, difficulty_curve=None):
+        if not pygame.get_init():
+            init()
+        self.dtime = dtime  # Seconds simulated per tick.
+        self.ticks = 0
+        self.profiler = profiler.Profiler(enabled=False)
+        self.game = game.Game(grab_input=False, seed=seed, difficulty_curve=difficulty_curve)
+
+    def tick(self, inputs=input_snapshot.EMPTY):
+        """ Simulate one tick with inputs (an Input_Snapshot). """
+        self.game.update_game(self, inputs)
+        self.ticks += 1
+
+    def run(self, ticks, controller=None):
+        """ Simulate ticks ticks. controller(main) returns the Input_Snapshot for each tick
+        (no input if it's None). Returns the number of ticks simulated per second of real time. """
+        start = time.perf_counter()
+        for _ in range(ticks):
+            self.tick(input_snapshot.EMPTY if controller is None else controller(self))
+        return ticks / max(time.perf_counter() - start, 1e-9)
+
+
+if __name__ == "__main__":
+    headless_main = Headless_Main()
+    rate = headless_main.run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
+    print("{} ticks at {:.0f} ticks/s, score {}, {} zombies".format(
+        headless_main.ticks, rate, headless_main.game.score, len(headless_main.game.zombie_handler.zombies)))
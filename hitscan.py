@@ -0,0 +1,68 @@
+""" Hitscan engine - tests one or more rays against every zombie at once.
+Each ray starts at the same point and goes on forever in its own direction. Uses NumPy if it's
+installed (all rays against all zombies in a few array operations), otherwise plain Python. """
+import math
+import zombie_store
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional.
+    numpy = None
+
+
+def cast(zombie_handler, origin_x, origin_y, angles, penetration=1):
+    """ Fire rays from (origin_x, origin_y) at each angle (radians).
+    Returns a list with one list per ray of (distance, zombie) for the zombies the ray goes through,
+    nearest first, at most penetration of them. distance is where the ray enters the zombie. """
+    if numpy is None:
+        return [cast_one(zombie_handler.zombies, origin_x, origin_y, angle, penetration) for angle in angles]
+    xs, ys, radii, zombies = target_arrays(zombie_handler)
+    if not zombies:
+        return [[] for _ in angles]
+    angles = numpy.asarray(angles, dtype=float)
+    dir_x = numpy.cos(angles)[:, None]
+    dir_y = numpy.sin(angles)[:, None]
+    rel_x = xs - origin_x
+    rel_y = ys - origin_y
+    along = rel_x * dir_x + rel_y * dir_y  # (rays, zombies) distance along each ray to the closest point.
+    off_squared = (rel_x * rel_x + rel_y * rel_y) - along * along
+    hit = (along > 0) & (off_squared <= radii * radii)
+    entry = along - numpy.sqrt(numpy.maximum(radii * radii - off_squared, 0))
+    results = []
+    for ray in range(len(angles)):
+        indices = numpy.flatnonzero(hit[ray])
+        if len(indices) > penetration:
+            indices = indices[numpy.argpartition(entry[ray, indices], penetration - 1)[:penetration]]
+        ray_hits = sorted(zip(entry[ray, indices].tolist(), indices.tolist()))
+        results.append([(distance, zombies[index]) for distance, index in ray_hits])
+    return results
+
+
+def cast_one(zombies, origin_x, origin_y, angle, penetration=1):
+    """ Plain Python version of cast for one ray. """
+    dir_x = math.cos(angle)
+    dir_y = math.sin(angle)
+    hits = []
+    for zombie in zombies:
+        pos = zombie.pos
+        rel_x = pos.x - origin_x
+        rel_y = pos.y - origin_y
+        along = rel_x * dir_x + rel_y * dir_y
+        off_squared = rel_x * rel_x + rel_y * rel_y - along * along
+        if along > 0 and off_squared <= zombie.radius ** 2:
+            hits.append((along - math.sqrt(max(zombie.radius ** 2 - off_squared, 0)), id(zombie), zombie))
+    hits.sort()
+    return [(distance, zombie) for distance, _, zombie in hits[:penetration]]
+
+
+def target_arrays(zombie_handler):
+    """ Return arrays of the zombies' x, y and radius, and the list of zombies they belong to. """
+    if isinstance(zombie_handler, zombie_store.Array_Zombie_Handler):
+        count = zombie_handler.count
+        return (zombie_handler.x[:count], zombie_handler.y[:count], zombie_handler.radius[:count],
+                zombie_handler.zombies)
+    zombies = zombie_handler.zombies
+    xs = numpy.fromiter((zombie.pos.x for zombie in zombies), float, len(zombies))
+    ys = numpy.fromiter((zombie.pos.y for zombie in zombies), float, len(zombies))
+    radii = numpy.fromiter((zombie.radius for zombie in zombies), float, len(zombies))
+    return xs, ys, radii, zombies
@@ -0,0 +1,46 @@
+""" Hud object - keeps the surfaces used for the HUD (score text, clip bar, pause veil) so they
+are only rebuilt when they change, and caches fonts by size. """
+import pygame
+
+
+class Hud:
+    """ Cached text, fonts and HUD backgrounds. """
+    def __init__(self, font_name="Courier New"):
+        self.font_name = font_name
+        self.fonts = {}
+        self.texts = {}  # key: (value, font, color, surface)
+        self.veil = None
+        self.clip_bar_background = None
+
+    def font(self, size):
+        """ Return the font at size, only loading it the first time (SysFont scans the system fonts). """
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.SysFont(self.font_name, size)
+            self.fonts[size] = font
+        return font
+
+    def text(self, key, value, font, color=(0, 0, 0)):
+        """ Return a surface of value rendered with font.
+        key names the bit of text - it's only rendered again when the value, font or color change. """
+        cached = self.texts.get(key)
+        if cached is None or cached[0] != value or cached[1] is not font or cached[2] != color:
+            cached = (value, font, color, font.render(str(value), True, color))
+            self.texts[key] = cached
+        return cached[3]
+
+    def pause_veil(self, size):
+        """ Return the see-through white surface shown over the window when paused.
+        Only rebuilt if the window size has changed. """
+        if self.veil is None or self.veil.get_size() != size:
+            self.veil = pygame.Surface(size)
+            self.veil.fill((255, 255, 255))
+            self.veil.set_alpha(128)
+        return self.veil
+
+    def clip_bar(self, size):
+        """ Return the black background of the clip bar. Only rebuilt if size has changed. """
+        if self.clip_bar_background is None or self.clip_bar_background.get_size() != size:
+            self.clip_bar_background = pygame.Surface(size)
+            self.clip_bar_background.fill((0, 0, 0))
+        return self.clip_bar_background
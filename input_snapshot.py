@@ -0,0 +1,73 @@
+""" Input_Snapshot object - everything the simulation reads from the player's input for one tick.
+Game.update_game/update_frame take a snapshot instead of asking pygame, so the game can be run
+without a window (see headless.py) and fed made up or recorded input. """
+# pylint: disable=no-member
+import pygame
+
+# Keys the game reads while they're held, and the keys it reads when they're tapped.
+HELD_KEYS = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d)
+TAPPED_KEYS = (pygame.K_ESCAPE, pygame.K_r) + tuple(range(pygame.K_1, pygame.K_9 + 1))
+
+
+class Input_Snapshot:
+    """ The input for one tick.
+    held - set of keys held down (only HELD_KEYS are captured from pygame).
+    tapped - set of keys pressed this tick (only TAPPED_KEYS are captured from pygame).
+    clicks - number of times a mouse button was pressed this tick.
+    mouse_held - is the left mouse button held down?
+    aim - where the mouse is on the game window (Vec2, 0 to 1), or None to leave the player's rotation. """
+    __slots__ = ("held", "tapped", "clicks", "mouse_held", "aim")
+
+    def __init__(self, held=(), tapped=(), clicks=0, mouse_held=False, aim=None):
+        self.held = frozenset(held)
+        self.tapped = frozenset(tapped)
+        self.clicks = clicks
+        self.mouse_held = mouse_held
+        self.aim = aim
+
+    def is_held(self, key):
+        """ Is key held down? """
+        return key in self.held
+
+    def is_tapped(self, key):
+        """ Was key pressed this tick? """
+        return key in self.tapped
+
+    def held_only(self):
+        """ Return a copy without the taps and clicks - for the later ticks of a frame, so a tap only
+        counts once. """
+        return Input_Snapshot(self.held, (), 0, self.mouse_held, self.aim)
+
+    def combine(self, later):
+        """ Return a snapshot with the taps and clicks of self and later and everything else from later -
+        for frames that didn't run a tick, so their taps aren't lost. """
+        return Input_Snapshot(later.held, self.tapped | later.tapped, self.clicks + later.clicks,
+                              later.mouse_held, later.aim)
+
+    def __str__(self):
+        """ return string in format "Input_Snapshot(held, tapped, clicks, mouse_held, aim)". """
+        return "Input_Snapshot({}, {}, {}, {}, {})".format(sorted(self.held), sorted(self.tapped), self.clicks,
+                                                           self.mouse_held, self.aim)
+
+    def __repr__(self):
+        """ Just return __str__ result. """
+        return self.__str__()
+
+
+# No input at all - nothing held, nothing pressed, aim left alone.
+EMPTY = Input_Snapshot()
+
+
+def capture(main):
+    """ Make a snapshot of the live pygame input (main.pygame_events must be this frame's events). """
+    keys = pygame.key.get_pressed()
+    held = [key for key in HELD_KEYS if keys[key]]
+    tapped = []
+    clicks = 0
+    for event in main.pygame_events:
+        if event.type == pygame.KEYDOWN and event.key in TAPPED_KEYS:
+            tapped.append(event.key)
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            clicks += 1
+    aim = main.game.mouse_pos(main, scale_down=True)
+    return Input_Snapshot(held, tapped, clicks, bool(pygame.mouse.get_pressed()[0]), aim)
@@ -1,10 +1,21 @@
 """ The main program file.
 This game is made primarily with objects. """
 # pylint: disable=no-member
+import time
 import pygame
-import glob
+import assets
+import dirty_rects
 import game
+import hud
+import input_snapshot
+import overlay
+import profiler
+import quality
+import recording
 import rect
+import render_queue
+import settings
+import sprite_cache
 
 
 class Main:
@@ -13,54 +24,126 @@ class Main:
     # pylint: disable=too-many-function-args
     # This will contains lots of isntance variables - but that's okay, I swear.
 
-    def __init__(self):
+    def __init__(self, replay=None):
+        self.start_time = time.perf_counter()
+        self.startup_time = None
+        self.assets = assets.Asset_Loader("images")
+        self.assets.start()  # Decode the images while the window comes up.
+
         self.full_window = None
         self.full_window_size = None
         self.game_window = None
         self.game_window_width = None
+        self.scaled_game_window = None
+        self.display_width = None
+        self.sprite_cache = sprite_cache.Sprite_Cache()
+        self.overlay = overlay.Overlay(hide_full_health=settings.HIDE_FULL_HEALTH_BARS)
+        self.render_queue = render_queue.Render_Queue()
+        self.hud = hud.Hud()
+        self.dirty_rects = dirty_rects.Dirty_Rects(enabled=settings.DIRTY_RECTS)
+        self.render_queue.track_rects = self.dirty_rects.enabled
+        self.governor = quality.Quality_Governor(budget=settings.FRAME_BUDGET, enabled=settings.QUALITY_GOVERNOR)
+        self.frame_time = 0  # Seconds spent on the last frame (not counting waiting in clock.tick).
+        self.profiler = profiler.Profiler(enabled=settings.PROFILER, export_path=settings.PROFILE_EXPORT)
+        self.ticks = 0  # Ticks simulated this frame.
         self.set_window()
 
         self.clock = pygame.time.Clock()
-        self.dtime = 0
+        self.frame_dtime = 0  # Real seconds since the last frame.
+        self.dtime = 1 / settings.TICK_RATE if settings.TICK_RATE else 0  # Seconds simulated per tick.
+        self.accumulator = 0  # Real time not simulated yet.
+        self.interpolation = 1  # How far between the last two ticks to draw (0 to 1).
+        self.waiting_inputs = None  # Input from frames that didn't run a tick.
 
         self.pygame_events = []
-        self.images = image_dict("images")
 
-        self.game = game.Game()
+        self.replay = replay  # A recording.Replay to take the input (and seed) from instead of the player.
+        self.game = game.Game(seed=replay.seed if replay is not None else None)
+        if settings.RECORD:
+            self.game.recorder = recording.Recorder(settings.RECORD, self.game.seed)
+
+    @property
+    def images(self):
+        """ The image dictionary - loaded lazily by self.assets the first time it's needed. """
+        return self.assets.images()
 
     def set_window(self, size=rect.Size(800, 600)):
         """ Set self.window to a new window of dimentions size (and self.full_window_rect)
-        Set self.game_window to a square surface to be centred on the main window. """
-        self.full_window = pygame.display.set_mode(
-            size.get_values(), pygame.RESIZABLE)
+        Set self.game_window to a square surface to be centred on the main window.
+        The game window is display_width wide on screen, but is drawn at settings.RENDER_WIDTH
+        (if set, and scaled down by the quality governor) and scaled up when it's shown. """
+        self.full_window = None
+        if settings.VSYNC:
+            try:
+                self.full_window = pygame.display.set_mode(size.get_values(), pygame.RESIZABLE, vsync=1)
+            except pygame.error:  # Not every renderer can do vsync.
+                pass
+        if self.full_window is None:
+            self.full_window = pygame.display.set_mode(
+                size.get_values(), pygame.RESIZABLE)
         self.full_window_size = size
-        self.game_window_width = min([size.w, size.h])
+        self.display_width = min([size.w, size.h])
+        self.game_window_offset = rect.Pos(x=(self.full_window_size.w-self.display_width)/2,
+                                           y=(self.full_window_size.h-self.display_width)/2)
+        self.set_render_width(round(self.base_render_width() * self.governor.render_scale()))
+
+    def base_render_width(self):
+        """ The width to draw the game window at before the quality governor scales it. """
+        return settings.RENDER_WIDTH or self.display_width
+
+    def set_render_width(self, width):
+        """ Set the width the game window is drawn at (self.game_window_width).
+        The sprite cache and shadow stamps are cleared if the width changes. """
+        if width != self.game_window_width:
+            self.sprite_cache.clear()
+            self.overlay.clear()
+        self.game_window_width = width
         self.game_window = pygame.Surface((self.game_window_width,) * 2)
-        self.game_window_offset = rect.Pos(x=(self.full_window_size.w-self.game_window_width)/2,
-                                           y=(self.full_window_size.h-self.game_window_width)/2)
+        if self.game_window_width != self.display_width:
+            self.scaled_game_window = pygame.Surface((self.display_width,) * 2)
+        else:
+            self.scaled_game_window = None
+        self.dirty_rects.full_redraw = True
+
+    def displayed_game_window(self):
+        """ Return the game window at the size it's shown on screen.
+        If it's drawn at a different resolution it is scaled up (one transform for the whole frame). """
+        if self.scaled_game_window is None:
+            return self.game_window
+        if settings.SMOOTH_SCALE:
+            pygame.transform.smoothscale(self.game_window, (self.display_width,) * 2, self.scaled_game_window)
+        else:
+            pygame.transform.scale(self.game_window, (self.display_width,) * 2, self.scaled_game_window)
+        return self.scaled_game_window
 
     def event_loop(self):
         """ Run the pygame event loop and quit when the quit button and escape are pressed.
         Set self.pygame_events to the pygame events.
-        Set self.dtime to the time since this was last called in seconds. """
+        Set self.frame_dtime to the time since this was last called in seconds (waiting first if
+        that would go over settings.FRAME_CAP frames per second).
+        F3 turns the profiler overlay on and off.
+        The sprite cache stats are printed on quit (to help tune the angle step). """
         self.pygame_events = pygame.event.get()
-        self.dtime = self.clock.tick() / 1000
+        self.frame_dtime = self.profiler.measure("wait", self.clock.tick, settings.FRAME_CAP) / 1000
         for event in self.pygame_events:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler.show_overlay = not self.profiler.show_overlay
+                self.dirty_rects.full_redraw = True
             # if event.type == pygame.KEYDOWN:
             #     if event.key == pygame.K_ESCAPE:
             #         pygame.quit()
             #         quit()
             if event.type == pygame.QUIT:
+                print(self.sprite_cache)
+                self.close()
                 pygame.quit()
                 quit()
 
-    def is_tapped(self, button):
-        """ Has the button been tapped?
-        (Is it in the pygame events thing?) """
-        for event in main.pygame_events:
-            if event.type == pygame.KEYDOWN:
-                if event.key == button:
-                    return True
+    def close(self):
+        """ Finish the recording and profile export files (if there are any). """
+        if self.game.recorder is not None:
+            self.game.recorder.close()
+        self.profiler.close()
 
     def update_window(self):
         """ Update self.window if the window has been resized. """
@@ -76,50 +159,113 @@ class Main:
             self.run_game()
 
     def run_game(self):
-        """ Run one frame of the game. """
-        self.event_loop()
-        self.update_window()
-        self.game.update_game(main)
-        self.game.update_display(main)
-        self.display_game()
+        """ Run one frame of the game.
+        The time the frame took is given to the quality governor.
+        Every stage is timed by self.profiler. """
+        self.profiler.measure("event_loop", self.event_loop)
+        start = time.perf_counter()
+        self.profiler.measure("update_window", self.update_window)
+        self.simulate(input_snapshot.capture(self))
+        self.profiler.measure("update_display", self.game.update_display, self)
+        self.profiler.measure("display_game", self.display_game)
+        self.frame_time = time.perf_counter() - start
+        self.governor.add_frame(self, self.frame_time)
+        self.end_profile_frame()
+
+    def end_profile_frame(self):
+        """ Give the profiler the frame time and entity counts, and finish its frame. """
+        if not self.profiler.enabled:
+            return
+        game_state = self.game
+        self.profiler.add("frame", self.frame_time * 1000)
+        self.profiler.count("ticks", self.ticks)
+        self.profiler.count("zombies", len(game_state.zombie_handler.zombies))
+        self.profiler.count("visible_zombies", game_state.zombie_handler.visible_count)
+        self.profiler.count("shots", len(game_state.shot_handler.shots))
+        if game_state.projectile_handler is not None:
+            self.profiler.count("projectiles", game_state.projectile_handler.count)
+        self.profiler.count("blits", self.render_queue.blit_count)
+        self.profiler.end_frame()
+
+    def simulate(self, inputs):
+        """ Run as many fixed ticks (self.dtime seconds each) as fit in the real time that has gone by,
+        keeping the rest for next frame. Taps and clicks go to the first tick only (or are kept for the
+        next frame that runs a tick). Sets self.interpolation for drawing between the last two ticks.
+        Without settings.TICK_RATE the game is updated once with the frame's time.
+        When replaying, each tick takes its input and dtime from self.replay instead. """
+        if self.waiting_inputs is not None:
+            inputs = self.waiting_inputs.combine(inputs)
+            self.waiting_inputs = None
+        self.ticks = 0
+        if not settings.TICK_RATE:
+            self.dtime = self.frame_dtime
+            self.tick(inputs)
+            return
+        self.accumulator = min(self.accumulator + self.frame_dtime, self.dtime * settings.MAX_TICKS_PER_FRAME)
+        if self.accumulator < self.dtime:
+            self.waiting_inputs = inputs
+        while self.accumulator >= self.dtime:
+            self.accumulator -= self.dtime
+            self.tick(inputs)
+            inputs = inputs.held_only()
+        self.interpolation = self.accumulator / self.dtime
+
+    def tick(self, inputs):
+        """ Run one tick of the game with inputs (or the next tick of self.replay). """
+        self.ticks += 1
+        if self.replay is not None:
+            self.replay_tick()
+        else:
+            self.profiler.measure("update_game", self.game.update_game, self, inputs)
+
+    def replay_tick(self):
+        """ Run the next tick of self.replay. At the end of the recording the player takes over. """
+        tick = self.replay.next_tick()
+        if tick is None:
+            print("Replay finished after {} ticks".format(self.replay.ticks))
+            self.replay.close()
+            self.replay = None
+            return
+        inputs, tick_dtime = tick
+        dtime = self.dtime
+        self.dtime = tick_dtime
+        self.profiler.measure("update_game", self.game.update_game, self, inputs)
+        self.dtime = dtime
 
     def display_game(self):
         """ Run all the display functions for the game and
-        blit the game_window to the main_window. """
+        blit the game_window to the main_window.
+        In dirty rect mode only the changed parts of the window are redrawn and updated. """
+        if self.dirty_rects.enabled:
+            if not self.dirty_rects.is_static(self):
+                self.dirty_rects.present(self, (100, 100, 100))
+            if self.startup_time is None:
+                self.report_startup()
+            return
         self.full_window.fill((100, 100, 100))
-        self.full_window.blit(self.game_window, self.game_window_offset.get_rounded_values())
+        self.full_window.blit(self.displayed_game_window(), self.game_window_offset.get_rounded_values())
         self.game.show_score(self)
         self.game.show_clip(self)
         if self.game.pause:
             self.game.pause_func(self)
+        self.profiler.show(self)
         pygame.display.update()
+        if self.startup_time is None:
+            self.report_startup()
 
-
-def image_dict(folder):
-    """ Return a dictionary of the images in folder, with sub-folders as sub-dicts. """
-    images = {}
-    items = glob.glob(folder + "/*")
-    for path in items:
-        if path.lower().endswith(".png"):
-            images[file_name(path)] = pygame.image.load(path)
-        else:
-            images[file_name(path)] = image_dict(path)
-    return images
-
-
-def file_name(path):
-    """ Return the name of the folder or item without the full path. """
-    for index in range(len(path) - 1, -1, -1):
-        if path[index] == "\\":
-            index += 1
-            break
-    name = path[index:]
-    if name.endswith(".png"):
-        name = name[:-4]
-    return name
+    def report_startup(self):
+        """ Record (and print) how long it took from Main being made to the first frame being shown. """
+        self.startup_time = time.perf_counter() - self.start_time
+        print("Startup took {:.3f}s ({} start, {} images from cache, {} decoded)".format(
+            self.startup_time, "warm" if self.assets.is_warm() else "cold",
+            self.assets.cache_hits, self.assets.cache_misses))
 
 
 if __name__ == "__main__":
     pygame.init()
-    main = Main()
+    if settings.SPLIT_PROCESSES:
+        import split_process
+        main = split_process.Split_Main()
+    else:
+        main = Main()
     main.run()
@@ -0,0 +1,60 @@
+""" Overlay object - draws the shadows and health bars for all the characters.
+Shadows are blitted from one pre-rendered stamp per radius and health bars are queued in the
+HUD layer of main.render_queue so they are drawn together. """
+import pygame
+import render_queue
+
+
+class Overlay:
+    """ Shared shadow stamps and health bar settings. """
+    def __init__(self, hide_full_health=False):
+        self.hide_full_health = hide_full_health  # Skip health bars for characters at full health?
+        self.show_shadows = True
+        self.show_health_bars = True
+        self.shadow_stamps = {}
+
+    def shadow_stamp(self, radius):
+        """ Return the shadow surface for a radius (in pixels), making it if it doesn't exist yet. """
+        stamp = self.shadow_stamps.get(radius)
+        if stamp is None:
+            stamp = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(stamp, (0, 0, 0, 100), (radius, radius), radius)
+            self.shadow_stamps[radius] = stamp
+        return stamp
+
+    def show_shadow(self, main, character):
+        """ Queue the shadow for character (a black circle, 0.8 of its radius). """
+        if not self.show_shadows:
+            return
+        x, y = character.draw_pos(main)
+        radius = int(character.radius * main.game_window_width * 0.8)
+        main.render_queue.add_blit(render_queue.SHADOW, self.shadow_stamp(radius),
+                                   (round(x * main.game_window_width) - radius,
+                                    round(y * main.game_window_width) - radius))
+
+    def add_health_bar(self, main, character, hide_full_health=False):
+        """ Queue the health bar above character's head.
+        Gets values from character.max_health and character.health.
+        Characters at full health are skipped if hide_full_health or self.hide_full_health is set. """
+        if not self.show_health_bars:
+            return
+        health_per = max(character.health, 0) / character.max_health
+        if (hide_full_health or self.hide_full_health) and health_per >= 1:
+            return
+        bar_width = character.radius * 2 * main.game_window_width
+        bar_height = bar_width * 0.2
+        x, y = character.draw_pos(main)
+        bar_x = round((x - character.radius) * main.game_window_width)
+        bar_y = round((y - character.radius) * main.game_window_width - bar_height * 2)
+        bar_width = round(bar_width)
+        bar_height = round(bar_height)
+        bar_fill = round(bar_width * health_per)
+        main.render_queue.add_draw(render_queue.HUD, pygame.Surface.fill, (200, 0, 0),
+                                   (bar_x, bar_y, bar_width, bar_height))
+        if bar_fill > 0:
+            main.render_queue.add_draw(render_queue.HUD, pygame.Surface.fill, (0, 200, 0),
+                                       (bar_x, bar_y, bar_fill, bar_height))
+
+    def clear(self):
+        """ Forget the shadow stamps (e.g. the window has changed size). """
+        self.shadow_stamps.clear()
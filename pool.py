@@ -0,0 +1,25 @@
+""" Pool object - a free list of objects to reuse instead of making new ones.
+Pooled objects need a reset method that takes the same arguments as __init__. """
+
+
+class Pool:
+    """ Hands out old objects (reset) before making new ones. """
+    def __init__(self, factory):
+        self.factory = factory  # Called to make a new object when the free list is empty.
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args):
+        """ Return an object set up with args - a reset one from the free list if there is one. """
+        if self.free:
+            item = self.free.pop()
+            item.reset(*args)
+            self.reused += 1
+            return item
+        self.created += 1
+        return self.factory(*args)
+
+    def release(self, item):
+        """ Give item back to be reused. It mustn't be used again until it's handed out by acquire. """
+        self.free.append(item)
@@ -0,0 +1,128 @@
+""" Profiler object - times each stage of a frame (and each handler's update and show).
+The last size frames of every scope are kept in ring buffers for the on-screen overlay (toggled with F3)
+and every frame can be written to a CSV or JSON lines file (settings.PROFILE_EXPORT). """
+import collections
+import csv
+import json
+import time
+
+# Scopes measured by the game, in the order they're shown (and the CSV columns).
+# frame doesn't include wait (clock.tick holding to the frame cap), event_loop does.
+# snapshot is only used in split mode (split_process.py), instead of update_game.
+SCOPES = ("frame", "wait", "event_loop", "update_window", "snapshot", "update_game", "player.update",
+          "flow_field.update", "shots.update", "projectiles.update", "zombies.update", "update_display",
+          "flow_field.show", "shots.show", "projectiles.show", "player.show", "zombies.show", "render_queue.flush",
+          "display_game")
+# Entity counts saved every frame.
+COUNTS = ("ticks", "zombies", "visible_zombies", "shots", "projectiles", "blits")
+
+
+class Profiler:
+    """ Ring buffers of the milliseconds each scope took per frame.
+    measure times a call, end_frame moves this frame's times into the buffers. """
+    def __init__(self, size=300, enabled=True, export_path=None):
+        self.size = size  # Frames kept.
+        self.enabled = enabled
+        self.show_overlay = False
+        self.times = {}  # Scope name: deque of milliseconds.
+        self.frame = {}  # Scope name: milliseconds so far this frame (a scope can run more than once).
+        self.counts = dict.fromkeys(COUNTS, 0)
+        self.frame_number = 0
+        self.lines = []  # Overlay text.
+        self.lines_time = 0  # When self.lines was last worked out.
+        self.export_file = None
+        self.writer = None
+        if export_path is not None:
+            self.start_export(export_path)
+
+    def measure(self, name, function, *args):
+        """ Return function(*args), adding the time it took to scope name. """
+        if not self.enabled:
+            return function(*args)
+        start = time.perf_counter()
+        result = function(*args)
+        self.add(name, (time.perf_counter() - start) * 1000)
+        return result
+
+    def add(self, name, milliseconds):
+        """ Add milliseconds to scope name for this frame. """
+        self.frame[name] = self.frame.get(name, 0) + milliseconds
+
+    def count(self, name, value):
+        """ Set an entity count (see COUNTS) for this frame. """
+        self.counts[name] = value
+
+    def end_frame(self):
+        """ Move this frame's times into the ring buffers (and the export file) and start a new frame. """
+        if not self.enabled:
+            return
+        for name, milliseconds in self.frame.items():
+            buffer = self.times.get(name)
+            if buffer is None:
+                buffer = self.times[name] = collections.deque(maxlen=self.size)
+            buffer.append(milliseconds)
+        if self.export_file is not None:
+            self.export_frame()
+        self.frame = {}
+        self.frame_number += 1
+
+    def stats(self, name):
+        """ Return (last, mean, 95th percentile) milliseconds of scope name over the buffer. """
+        buffer = self.times.get(name)
+        if not buffer:
+            return 0, 0, 0
+        ordered = sorted(buffer)
+        return buffer[-1], sum(buffer) / len(buffer), ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def start_export(self, path):
+        """ Write every frame to path - JSON lines if it ends in .jsonl, otherwise CSV. """
+        self.export_file = open(path, "w", newline="")
+        if not path.endswith(".jsonl"):
+            self.writer = csv.DictWriter(self.export_file, ("frame_number",) + SCOPES + COUNTS, extrasaction="ignore")
+            self.writer.writeheader()
+
+    def export_frame(self):
+        """ Write this frame's times and counts to the export file. """
+        row = {"frame_number": self.frame_number}
+        row.update((name, round(milliseconds, 4)) for name, milliseconds in self.frame.items())
+        row.update(self.counts)
+        if self.writer is not None:
+            self.writer.writerow(row)
+        else:
+            self.export_file.write(json.dumps(row) + "\n")
+
+    def close(self):
+        """ Close the export file (if there is one). """
+        if self.export_file is not None:
+            self.export_file.close()
+            self.export_file = None
+
+    def overlay_lines(self):
+        """ Return the overlay text - a line per scope (last, mean and p95 ms) then the counts.
+        Only worked out again four times a second, so it's readable. """
+        now = time.perf_counter()
+        if now - self.lines_time > 0.25:
+            self.lines_time = now
+            self.lines = ["{:<19}{:>7}{:>7}{:>7}".format("ms", "last", "mean", "p95")]
+            for name in SCOPES:
+                if name in self.times:
+                    self.lines.append("{:<19}{:>7.2f}{:>7.2f}{:>7.2f}".format(name, *self.stats(name)))
+            self.lines.append(" ".join("{} {}".format(name, value) for name, value in self.counts.items()))
+        return self.lines
+
+    def show(self, main):
+        """ Draw the overlay in the bottom left of main.full_window (if it's turned on).
+        Returns the rectangles drawn on. """
+        if not self.show_overlay:
+            return []
+        font = main.hud.font(max(12, main.display_width // 40))
+        lines = self.overlay_lines()
+        height = font.get_linesize()
+        top = main.full_window_size.h - height * len(lines)
+        rects = []
+        for number, line in enumerate(lines):
+            text = main.hud.text("profiler{}".format(number), line, font, (255, 255, 255))
+            rect = text.get_rect(topleft=(0, top + number * height))
+            main.full_window.fill((0, 0, 0), rect)
+            rects.append(main.full_window.blit(text, rect))
+        return rects
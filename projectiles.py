@@ -0,0 +1,134 @@
+""" Projectile_Handler object - bullets that travel (rather than hitscan shots).
+Every bullet is kept in NumPy arrays and moved in one go. Collisions are swept circle tests
+against the zombies along the whole path the bullet took this frame, so fast bullets can't skip
+through a zombie when the frame rate is low. """
+import pygame
+import hitscan
+import render_queue
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional - without it there are no projectile weapons.
+    numpy = None
+
+FIELDS = ("x", "y", "vx", "vy", "damage", "expire_time")
+
+
+def available():
+    """ Can projectiles be used (is NumPy installed)? """
+    return numpy is not None
+
+
+class Projectile_Handler:
+    """ Handles all the projectiles. Runs next to the Shot_Handler. """
+    def __init__(self, capacity=256, radius=0.002, max_checks=1000000):
+        self.radius = radius  # Of every bullet, in screen widths.
+        self.max_checks = max_checks  # Most bullet-zombie pairs tested in one array operation.
+        self.time = 0  # Simulation time in seconds, bullets expire at expire_time.
+        self.count = 0
+        self.stamps = {}
+        for name in FIELDS:
+            setattr(self, name, numpy.zeros(capacity))  # Only the first self.count are bullets.
+
+    def fire(self, x, y, vx, vy, damage, life):
+        """ Add a bullet at x, y moving at vx, vy (screen widths per second) that lasts life seconds. """
+        if self.count == len(self.x):
+            for name in FIELDS:
+                array = getattr(self, name)
+                setattr(self, name, numpy.concatenate((array, numpy.zeros(len(array)))))
+        index = self.count
+        self.x[index] = x
+        self.y[index] = y
+        self.vx[index] = vx
+        self.vy[index] = vy
+        self.damage[index] = damage
+        self.expire_time[index] = self.time + life
+        self.count += 1
+
+    def update(self, main):
+        """ Move all the bullets, damage the first zombie each one hits this frame and forget the
+        bullets that hit something, ran out of time or left the screen. """
+        self.time += main.dtime
+        count = self.count
+        if not count:
+            return
+        x, y = self.x[:count], self.y[:count]
+        move_x = self.vx[:count] * main.dtime
+        move_y = self.vy[:count] * main.dtime
+        hit_zombie, hit_time = self.sweep(main.game.zombie_handler, x, y, move_x, move_y)
+        hit = hit_zombie >= 0
+        # Bullets that hit stop where they hit, the rest move the whole way.
+        travel = numpy.where(hit, hit_time, 1)
+        x += move_x * travel
+        y += move_y * travel
+        if hit.any():
+            zombies = hitscan.target_arrays(main.game.zombie_handler)[3]
+            for zombie_index, damage in zip(hit_zombie[hit].tolist(), self.damage[:count][hit].tolist()):
+                zombies[zombie_index].health -= damage
+        keep = ~hit & (self.expire_time[:count] > self.time) & (x > -0.1) & (x < 1.1) & (y > -0.1) & (y < 1.1)
+        self.validate(keep)
+
+    def sweep(self, zombie_handler, x, y, move_x, move_y):
+        """ Swept circle test of every bullet's path this frame against every zombie.
+        Returns (index of the first zombie hit or -1, fraction of the path travelled before the hit). """
+        count = len(x)
+        hit_zombie = numpy.full(count, -1)
+        hit_time = numpy.ones(count)
+        zombie_x, zombie_y, zombie_radius, _ = hitscan.target_arrays(zombie_handler)
+        if not len(zombie_x):
+            return hit_zombie, hit_time
+        reach = zombie_radius + self.radius
+        rows = max(1, self.max_checks // len(zombie_x))
+        for start in range(0, count, rows):
+            part = slice(start, start + rows)
+            # Solve |start + t * move - zombie| = reach for t (a quadratic: a t^2 + b t + c = 0).
+            from_x = x[part, None] - zombie_x
+            from_y = y[part, None] - zombie_y
+            a = (move_x[part] ** 2 + move_y[part] ** 2)[:, None]
+            b = 2 * (from_x * move_x[part, None] + from_y * move_y[part, None])
+            c = from_x ** 2 + from_y ** 2 - reach ** 2
+            discriminant = b * b - 4 * a * c
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                t = (-b - numpy.sqrt(numpy.maximum(discriminant, 0))) / (2 * a)
+            t = numpy.where(c <= 0, 0, t)  # Already inside the zombie.
+            touching = (c <= 0) | ((discriminant >= 0) & (t >= 0) & (t <= 1))
+            t = numpy.where(touching, t, numpy.inf)
+            first = numpy.argmin(t, axis=1)
+            first_time = t[numpy.arange(len(first)), first]
+            found = numpy.isfinite(first_time)
+            hit_zombie[part] = numpy.where(found, first, -1)
+            hit_time[part] = numpy.where(found, first_time, 1)
+        return hit_zombie, hit_time
+
+    def validate(self, keep):
+        """ Forget the bullets where keep is False (moving the rest down to fill the gaps). """
+        living = int(numpy.count_nonzero(keep))
+        if living == self.count:
+            return
+        for name in FIELDS:
+            array = getattr(self, name)
+            array[:living] = array[:self.count][keep]
+        self.count = living
+
+    def stamp(self, size):
+        """ Return the (size by size pixel) surface every bullet is drawn with. """
+        stamp = self.stamps.get(size)
+        if stamp is None:
+            stamp = pygame.Surface((size, size))
+            stamp.fill((0, 0, 0))
+            self.stamps[size] = stamp
+        return stamp
+
+    def show(self, main):
+        """ Queue every bullet - one stamp per bullet, all sent in the render queue's single blits call.
+        Bullets are drawn where they were main.interpolation of the way through the last tick. """
+        count = self.count
+        if not count:
+            return
+        size = max(2, round(self.radius * 2 * main.game_window_width))
+        behind = (1 - main.interpolation) * main.dtime
+        x = self.x[:count] - self.vx[:count] * behind
+        y = self.y[:count] - self.vy[:count] * behind
+        left = numpy.rint(x * main.game_window_width - size / 2).astype(int)
+        top = numpy.rint(y * main.game_window_width - size / 2).astype(int)
+        main.render_queue.add_blits(render_queue.SHOT, self.stamp(size), zip(left.tolist(), top.tolist()))
@@ -0,0 +1,87 @@
+""" Quality_Governor object - watches how long frames take and turns the render quality down
+when they go over budget (and back up when there's room again). """
+import collections
+
+# Quality levels, best first. Each level is the settings used while the governor is on it.
+LEVELS = [
+    {"name": "full", "render_scale": 1, "angle_step": 3, "shadows": True, "health_bars": True},
+    {"name": "coarse rotation", "render_scale": 1, "angle_step": 10, "shadows": True, "health_bars": True},
+    {"name": "no health bars", "render_scale": 1, "angle_step": 10, "shadows": True, "health_bars": False},
+    {"name": "no shadows", "render_scale": 1, "angle_step": 15, "shadows": False, "health_bars": False},
+    {"name": "low resolution", "render_scale": 0.6, "angle_step": 15, "shadows": False, "health_bars": False},
+    {"name": "lowest resolution", "render_scale": 0.4, "angle_step": 20, "shadows": False, "health_bars": False},
+]
+
+
+class Quality_Governor:
+    """ Keeps a rolling window of frame times and steps the quality level down when the chosen
+    percentile is over budget, or up when it's comfortably under.
+    A level has to be kept for a while before it can change again (hysteresis). """
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, budget=1 / 60, percentile=0.9, window=60, down_after=30, up_after=180, headroom=0.6,
+                 enabled=True):
+        self.enabled = enabled
+        self.budget = budget  # Seconds per frame.
+        self.percentile = percentile
+        self.frame_times = collections.deque(maxlen=window)
+        self.down_after = down_after  # Frames at a level before it can step down.
+        self.up_after = up_after  # Frames at a level before it can step up.
+        self.headroom = headroom  # Step up when the percentile is under budget * headroom.
+        self.level = 0
+        self.frames_at_level = 0
+        self.last_percentile = 0
+        self.changes = 0
+
+    def settings(self):
+        """ Return the dictionary of settings for the current level. """
+        return LEVELS[self.level]
+
+    def level_name(self):
+        """ Name of the current level, for telemetry. """
+        return LEVELS[self.level]["name"]
+
+    def render_scale(self):
+        """ Fraction of the normal render width to draw at. """
+        return LEVELS[self.level]["render_scale"]
+
+    def frame_time_percentile(self):
+        """ The self.percentile frame time (seconds) of the frames in the window. """
+        if not self.frame_times:
+            return 0
+        times = sorted(self.frame_times)
+        return times[min(len(times) - 1, int(len(times) * self.percentile))]
+
+    def add_frame(self, main, frame_time):
+        """ Record how long a frame took (seconds) and change the level if needed. """
+        if not self.enabled:
+            return
+        self.frame_times.append(frame_time)
+        self.frames_at_level += 1
+        if len(self.frame_times) < self.frame_times.maxlen:
+            return
+        self.last_percentile = self.frame_time_percentile()
+        if self.last_percentile > self.budget and self.frames_at_level >= self.down_after:
+            self.set_level(main, self.level + 1)
+        elif self.last_percentile < self.budget * self.headroom and self.frames_at_level >= self.up_after:
+            self.set_level(main, self.level - 1)
+
+    def set_level(self, main, level):
+        """ Change to level (if it exists) and apply it. The frame time window starts again. """
+        level = max(0, min(len(LEVELS) - 1, level))
+        if level == self.level:
+            return
+        self.level = level
+        self.frames_at_level = 0
+        self.frame_times.clear()
+        self.changes += 1
+        self.apply(main)
+
+    def apply(self, main):
+        """ Push the current level's settings to the sprite cache, overlay and render width. """
+        level = self.settings()
+        main.sprite_cache.angle_step = level["angle_step"]
+        main.overlay.show_shadows = level["shadows"]
+        main.overlay.show_health_bars = level["health_bars"]
+        width = main.base_render_width()
+        if round(width * level["render_scale"]) != main.game_window_width:
+            main.set_render_width(round(width * level["render_scale"]))
@@ -0,0 +1,134 @@
+""" Recording and replaying games.
+A recording is the game's random seed plus the Input_Snapshot and dtime of every tick, in a small
+gzipped binary file. The same seed and input give the same game, so a slow session can be replayed
+headless (as fast as possible, timing every tick) or in real time with the window.
+Replays only match the original with the same settings - and settings.AI_SCHEDULER's time budget
+depends on how fast the computer is, so leave it off (or AI_BUDGET very high) when recording.
+Replay from the top folder with: python recording.py file [--realtime] """
+# pylint: disable=no-member
+import gzip
+import struct
+import sys
+import time
+import pygame
+import headless
+import input_snapshot
+import rect
+
+MAGIC = b"TDSR"
+VERSION = 1
+HEADER = struct.Struct("<4sBQ")  # Magic, version, seed.
+TICK = struct.Struct("<BBdddB")  # Flags, clicks, dtime, aim x, aim y, number of tapped keys.
+KEY = struct.Struct("<I")
+
+# Flags byte - a bit per held key, then the mouse button and whether there's an aim.
+HELD_BITS = {key: 1 << bit for bit, key in enumerate(input_snapshot.HELD_KEYS)}
+MOUSE_HELD_BIT = 1 << 6
+AIM_BIT = 1 << 7
+
+
+class Recorder:
+    """ Writes a recording, a tick at a time (Game.update_game calls write when game.recorder is set). """
+    def __init__(self, path, seed):
+        self.path = path
+        self.file = gzip.open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed))
+        self.ticks = 0
+
+    def write(self, inputs, dtime):
+        """ Add one tick of inputs (an Input_Snapshot) that was simulated for dtime seconds. """
+        flags = 0
+        for key in inputs.held:
+            flags |= HELD_BITS.get(key, 0)
+        if inputs.mouse_held:
+            flags |= MOUSE_HELD_BIT
+        aim_x = aim_y = 0
+        if inputs.aim is not None:
+            flags |= AIM_BIT
+            aim_x, aim_y = inputs.aim.x, inputs.aim.y
+        tapped = sorted(inputs.tapped)
+        self.file.write(TICK.pack(flags, min(inputs.clicks, 255), dtime, aim_x, aim_y, len(tapped)))
+        for key in tapped:
+            self.file.write(KEY.pack(key))
+        self.ticks += 1
+
+    def close(self):
+        """ Finish the file. """
+        self.file.close()
+
+
+class Replay:
+    """ Reads a recording. Iterate over it for the (Input_Snapshot, dtime) of each tick. """
+    def __init__(self, path):
+        self.path = path
+        self.file = gzip.open(path, "rb")
+        magic, version, self.seed = HEADER.unpack(self.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("{} isn't a version {} recording".format(path, VERSION))
+        self.ticks = 0
+
+    def read(self, size):
+        """ Read exactly size bytes, or raise EOFError if the recording ends first. """
+        data = self.file.read(size)
+        if len(data) != size:
+            raise EOFError
+        return data
+
+    def next_tick(self):
+        """ Return the (Input_Snapshot, dtime) of the next tick, or None at the end of the recording. """
+        try:
+            flags, clicks, dtime, aim_x, aim_y, tap_count = TICK.unpack(self.read(TICK.size))
+            tapped = [KEY.unpack(self.read(KEY.size))[0] for _ in range(tap_count)]
+        except EOFError:
+            return None
+        held = [key for key, bit in HELD_BITS.items() if flags & bit]
+        aim = rect.Vec2(aim_x, aim_y) if flags & AIM_BIT else None
+        self.ticks += 1
+        return input_snapshot.Input_Snapshot(held, tapped, clicks, bool(flags & MOUSE_HELD_BIT), aim), dtime
+
+    def __iter__(self):
+        """ Yield (Input_Snapshot, dtime) for every tick. """
+        tick = self.next_tick()
+        while tick is not None:
+            yield tick
+            tick = self.next_tick()
+
+    def close(self):
+        """ Close the file. """
+        self.file.close()
+
+
+def replay_headless(path):
+    """ Replay the recording at path with no window, as fast as possible.
+    Returns the headless main (for the final game state) and a list of how long each tick took (seconds). """
+    replay = Replay(path)
+    main = headless.Headless_Main(seed=replay.seed)
+    tick_times = []
+    for inputs, dtime in replay:
+        main.dtime = dtime
+        start = time.perf_counter()
+        main.tick(inputs)
+        tick_times.append(time.perf_counter() - start)
+    replay.close()
+    return main, tick_times
+
+
+def replay_realtime(path):
+    """ Replay the recording at path in the game window (see main.Main.replay). Runs until the window is closed. """
+    import main as main_module  # Not at the top - main imports this module.
+    pygame.init()
+    main_module.main = main_module.Main(replay=Replay(path))
+    main_module.main.run()
+
+
+if __name__ == "__main__":
+    if "--realtime" in sys.argv[2:]:
+        replay_realtime(sys.argv[1])
+    else:
+        replay_start = time.perf_counter()
+        replayed, times = replay_headless(sys.argv[1])
+        took = time.perf_counter() - replay_start
+        print("{} ticks in {:.2f}s ({:.0f} ticks/s), score {}".format(
+            len(times), took, len(times) / max(took, 1e-9), replayed.game.score))
+        slowest = sorted(range(len(times)), key=times.__getitem__, reverse=True)[:5]
+        print("Slowest ticks:", ", ".join("{} ({:.2f}ms)".format(tick, times[tick] * 1000) for tick in slowest))
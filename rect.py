@@ -1,4 +1,6 @@
-""" Contains Rect, Size and Pos classes with extra helper functions. """
+""" Contains Rect, Size and Pos classes with extra helper functions.
+Also Vec2 - a small 2D vector for the per frame code, which changes itself rather than making new
+objects wherever it can. """
 import math
 
 
@@ -138,3 +140,94 @@ class Size(Rect):
         """ Returned a tuple of the rounded, scaled values. """
         return round(self.w * main.game_window_width), round(self.h * main.game_window_width)
 
+
+class Vec2:
+    """ 2D vector with just x and y (no w and h, no __dict__).
+    Methods that change the vector do it in place and return it, so calls can be chained. """
+    __slots__ = ("x", "y")
+
+    def __init__(self, x=0.0, y=0.0):
+        self.x = x
+        self.y = y
+
+    def copy(self):
+        """ Return a new Vec2 with the same values. """
+        return Vec2(self.x, self.y)
+
+    def set(self, x, y):
+        """ Set both values. """
+        self.x = x
+        self.y = y
+        return self
+
+    def set_from(self, other):
+        """ Copy the values of other (anything with x and y) into self. """
+        self.x = other.x
+        self.y = other.y
+        return self
+
+    def add_scaled(self, other, scale):
+        """ self += other * scale. """
+        self.x += other.x * scale
+        self.y += other.y * scale
+        return self
+
+    def scale_up(self, x_scale=1, y_scale=1):
+        """ Multiply x and y by x_scale and y_scale. """
+        self.x *= x_scale
+        self.y *= y_scale
+        return self
+
+    def rotate_around(self, point, angle):
+        """ Rotate self around point by angle radians. """
+        cos = math.cos(angle)
+        sin = math.sin(angle)
+        dx = self.x - point.x
+        dy = self.y - point.y
+        self.x = point.x + cos * dx - sin * dy
+        self.y = point.y + sin * dx + cos * dy
+        return self
+
+    def distance(self, other):
+        """ Distance from self to other (anything with x and y). """
+        return math.hypot(self.x - other.x, self.y - other.y)
+
+    def distance_squared(self, other):
+        """ Square of the distance from self to other - cheaper when just comparing distances. """
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return dx * dx + dy * dy
+
+    def get_values(self):
+        """ Return a tuple of x and y. """
+        return self.x, self.y
+
+    def get_rounded_values(self):
+        """ Return a tuple of x and y rounded. """
+        return round(self.x), round(self.y)
+
+    def scale_for_window(self, main):
+        """ Returned a tuple of the rounded, scaled values. """
+        width = main.game_window_width
+        return round(self.x * width), round(self.y * width)
+
+    def __str__(self):
+        """ return string in format "Vec2(x, y)". """
+        return "Vec2({}, {})".format(self.x, self.y)
+
+    def __repr__(self):
+        """ Just return __str__ result. """
+        return self.__str__()
+
+
+def scale_all_for_window(vectors, main):
+    """ scale_for_window for a list of vectors, returns a list of tuples. """
+    width = main.game_window_width
+    return [(round(vector.x * width), round(vector.y * width)) for vector in vectors]
+
+
+def distances(vectors, point):
+    """ Return a list of the distance from each vector to point. """
+    x = point.x
+    y = point.y
+    return [math.hypot(vector.x - x, vector.y - y) for vector in vectors]
@@ -0,0 +1,75 @@
+""" Render_Queue object - show() methods push draw commands here instead of drawing straight
+onto the game window. At the end of the frame the commands are sorted by layer (and texture)
+and the sprites are all sent to the window with one Surface.blits call.
+Textures are stable numbers (Sprite_Cache.texture) rather than the id of each rotated copy, so
+overlapping sprites don't swap places as they turn. """
+import time
+
+# Layers, drawn lowest first.
+SHOT = 0
+SHADOW = 1
+PLAYER = 2  # Under the zombies, whatever their textures.
+BODY = 3
+WEAPON = 4
+HUD = 5
+
+
+class Render_Queue:
+    """ Collects blits and draw calls for one frame. """
+    def __init__(self):
+        self.commands = []  # (layer, texture, order, surface or function, position or args)
+        self.flush_time = 0  # Seconds the last flush took.
+        self.blit_count = 0
+        self.draw_count = 0
+        self.track_rects = False  # Keep the rectangles drawn in self.drawn_rects?
+        self.drawn_rects = []
+
+    def add_blit(self, layer, surface, pos, texture=None):
+        """ Queue surface to be blitted at pos (x, y in game window pixels).
+        texture is the number blits in a layer are sorted by (id(surface) if it's None). """
+        self.commands.append((layer, texture or id(surface), len(self.commands), surface, pos))
+
+    def add_blits(self, layer, surface, positions, texture=None):
+        """ Queue surface to be blitted at every (x, y) in positions. """
+        texture = texture or id(surface)
+        order = len(self.commands)
+        self.commands.extend((layer, texture, order, surface, pos) for pos in positions)
+
+    def add_draw(self, layer, function, *args):
+        """ Queue function(target, *args) - e.g. pygame.draw.line or pygame.Surface.fill.
+        Draws in the same layer keep the order they were added in. """
+        self.commands.append((layer, 0, len(self.commands), function, args))
+
+    def flush(self, target):
+        """ Draw everything queued onto target (lowest layer first) and empty the queue.
+        Consecutive blits go to target.blits in one call.
+        If self.track_rects is set, self.drawn_rects is set to the rectangles that were drawn on. """
+        start = time.perf_counter()
+        self.commands.sort(key=lambda command: command[:3])
+        blits = []
+        self.blit_count = 0
+        self.draw_count = 0
+        self.drawn_rects = []
+        for command in self.commands:
+            if command[1]:
+                blits.append(command[3:])
+                continue
+            if blits:
+                self.submit(target, blits)
+                blits = []
+            drawn_rect = command[3](target, *command[4])
+            if self.track_rects:
+                self.drawn_rects.append(drawn_rect)
+            self.draw_count += 1
+        if blits:
+            self.submit(target, blits)
+        self.commands.clear()
+        self.flush_time = time.perf_counter() - start
+
+    def submit(self, target, blits):
+        """ Send a list of (surface, pos) to target in one call. """
+        if self.track_rects:
+            self.drawn_rects.extend(target.blits(blits))
+        else:
+            target.blits(blits, doreturn=False)
+        self.blit_count += len(blits)
@@ -0,0 +1,65 @@
+""" Settings for the optional features - change these to turn them on and off. """
+
+# Only redraw the parts of the window that changed, and only send those to the display.
+DIRTY_RECTS = False
+
+# Draw the game at this fixed width (e.g. 480) and scale it up to the window, so the cost per
+# entity doesn't depend on the window size. None draws at the window size.
+RENDER_WIDTH = None
+# Use pygame.transform.smoothscale (rather than scale) when scaling up to the window.
+SMOOTH_SCALE = False
+
+# Turn the render quality down (and back up) to keep frames inside FRAME_BUDGET seconds.
+QUALITY_GOVERNOR = True
+FRAME_BUDGET = 1 / 60
+
+# Draw zombies with less detail when at least this many are on screen:
+# no shadows, then also unrotated sprites and health bars only for hurt zombies.
+LOD_NO_SHADOWS = 300
+LOD_SIMPLE_ZOMBIES = 1000
+# Only draw health bars for characters that have been hurt (at every level of detail).
+HIDE_FULL_HEALTH_BARS = False
+
+# Keep the zombies in NumPy arrays and update them all at once (needs NumPy).
+ARRAY_ZOMBIES = False
+
+# Push overlapping zombies apart so crowds don't stack on one spot.
+ZOMBIE_SEPARATION = False
+
+# Zombies follow a shared flow field towards the player (so they can path around OBSTACLES)
+# rather than each heading straight for the player. OBSTACLES are (column, row) cells of the grid.
+FLOW_FIELD = False
+FLOW_FIELD_COLUMNS = 32
+OBSTACLES = []
+
+# Spread zombie steering over frames: zombies further than AI_NEAR_DISTANCE from the player steer
+# every AI_SLICES frames (and not at all once AI_BUDGET seconds have been used this frame).
+AI_SCHEDULER = False
+AI_SLICES = 4
+AI_NEAR_DISTANCE = 0.15
+AI_BUDGET = 0.002
+
+# Simulation ticks per second - the game is always updated in steps of 1 / TICK_RATE seconds and
+# drawn part way between the last two ticks. None updates once per frame with the frame's time.
+TICK_RATE = 60
+# Most ticks run in one frame - if the game falls further behind than this it slows down instead.
+MAX_TICKS_PER_FRAME = 5
+# Most frames drawn per second (0 for no limit), and whether to ask the display for vsync.
+FRAME_CAP = 120
+VSYNC = False
+
+# Record the seed and every tick's input to this file (replay it with recording.py). None doesn't record.
+RECORD = None
+
+# Time every stage of the frame (F3 shows the times on screen), and write them for every frame to this
+# file (.csv or .jsonl, e.g. "profile.csv") if it isn't None.
+PROFILER = True
+PROFILE_EXPORT = None
+
+# Run the simulation in its own process (see split_process.py) - the window process only draws the latest
+# tick it was sent, so a slow frame doesn't slow the game down. The most entities sent each tick are set by
+# the SPLIT_MAX_ settings (any more are simulated but not drawn). Recording and replays don't work in split mode.
+SPLIT_PROCESSES = False
+SPLIT_MAX_ZOMBIES = 20000
+SPLIT_MAX_SHOTS = 256
+SPLIT_MAX_PROJECTILES = 4096
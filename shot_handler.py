@@ -1,20 +1,26 @@
 """ An object to handle all the shots/bullets.
 Will call update and show methods for all shots. """
+import pool
 
 
 class Shot_Handler:
-    """ Handles all the shots. Shots must have an update and show method. """
+    """ Handles all the shots. Shots must have an update and show method.
+    Shots made with make_shot are pooled and reused once they're no longer valid. """
     def __init__(self):
         self.shots = []
+        self.pools = {}  # Shot class: pool.Pool
 
-    def add_shot(self, shot):
-        """ add shot to self.shots.
-        shot will already be an object. """
-        self.shots.append(shot)
+    def make_shot(self, shot_class, *args):
+        """ Add a shot_class(*args) to self.shots, reusing an old shot if there is one.
+        shot_class needs a reset method taking the same args. """
+        shot_pool = self.pools.get(shot_class)
+        if shot_pool is None:
+            shot_pool = self.pools[shot_class] = pool.Pool(shot_class)
+        self.shots.append(shot_pool.acquire(*args))
 
     def update(self, main):
         """ Update and validate all the shots. """
-        self.validate_shots()
+        self.validate_shots(main.game.time)
         for shot in self.shots:
             shot.update(main)
 
@@ -23,11 +29,19 @@ class Shot_Handler:
         for shot in self.shots:
             shot.show(main)
 
-    def validate_shots(self):
-        """ Ensure all shots are "valid".
-        delete shots that don't return True from shot.is_valid. """
-        valid = []
-        for shot in self.shots:
-            if shot.is_valid():
-                valid.append(shot)
-        self.shots = valid
\ No newline at end of file
+    def validate_shots(self, now):
+        """ Ensure all shots are "valid" at simulation time now.
+        delete shots that don't return True from shot.is_valid(now) (swapping in the last shot rather than
+        rebuilding the list) and give them back to their pool. """
+        shots = self.shots
+        index = 0
+        while index < len(shots):
+            shot = shots[index]
+            if shot.is_valid(now):
+                index += 1
+                continue
+            shots[index] = shots[-1]
+            shots.pop()
+            shot_pool = self.pools.get(type(shot))
+            if shot_pool is not None:
+                shot_pool.release(shot)
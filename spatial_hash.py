@@ -0,0 +1,88 @@
+""" Spatial_Hash object - a uniform grid of cells over the game, so collision queries only look at
+the things near a point rather than everything. """
+import math
+
+
+class Spatial_Hash:
+    """ Uniform grid of items (anything with pos and radius).
+    Rebuild it whenever the items have moved, then query it. """
+    # Cells to pair each cell with so every neighbouring pair of cells is only visited once.
+    NEIGHBOURS = ((1, 0), (-1, 1), (0, 1), (1, 1))
+
+    def __init__(self, cell_size=0.05):
+        self.cell_size = cell_size  # Screen widths - a bit bigger than the things in it works well.
+        self.cells = {}  # (column, row): [(x, y, radius, item), ...]
+        self.max_radius = 0
+
+    def cell(self, x, y):
+        """ Return the (column, row) of the cell that x, y is in. """
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def rebuild(self, items):
+        """ Put items in the grid (forgetting what was there). """
+        self.rebuild_from(((item.pos.x, item.pos.y, item.radius, item) for item in items))
+
+    def rebuild_from(self, entries):
+        """ Rebuild the grid from (x, y, radius, item) tuples. """
+        self.cells = {}
+        self.max_radius = 0
+        size = self.cell_size
+        for entry in entries:
+            key = (math.floor(entry[0] / size), math.floor(entry[1] / size))
+            cell = self.cells.get(key)
+            if cell is None:
+                self.cells[key] = [entry]
+            else:
+                cell.append(entry)
+            if entry[2] > self.max_radius:
+                self.max_radius = entry[2]
+
+    def query(self, x, y, radius):
+        """ Return the items touching the circle at x, y with radius (closer than the sum of the radii). """
+        reach = radius + self.max_radius
+        left, top = self.cell(x - reach, y - reach)
+        right, bottom = self.cell(x + reach, y + reach)
+        found = []
+        for column in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                for item_x, item_y, item_radius, item in self.cells.get((column, row), ()):
+                    limit = radius + item_radius
+                    if (item_x - x) ** 2 + (item_y - y) ** 2 < limit * limit:
+                        found.append(item)
+        return found
+
+    def overlapping_pairs(self):
+        """ Yield (first, second, dx, dy, distance) for every pair of items whose circles overlap.
+        dx and dy go from first to second. Only pairs in the same or neighbouring cells are checked,
+        so the cell size must be at least twice the largest radius. """
+        cells = self.cells
+        for (column, row), cell in cells.items():
+            for index, first in enumerate(cell):
+                for second in cell[index + 1:]:
+                    pair = overlap(first, second)
+                    if pair:
+                        yield pair
+            for d_column, d_row in self.NEIGHBOURS:
+                other_cell = cells.get((column + d_column, row + d_row))
+                if other_cell is None:
+                    continue
+                for first in cell:
+                    for second in other_cell:
+                        pair = overlap(first, second)
+                        if pair:
+                            yield pair
+
+    def __len__(self):
+        """ Number of items in the grid. """
+        return sum(len(cell) for cell in self.cells.values())
+
+
+def overlap(first, second):
+    """ Return (first item, second item, dx, dy, distance) if the two grid entries overlap, else None. """
+    dx = second[0] - first[0]
+    dy = second[1] - first[1]
+    limit = first[2] + second[2]
+    distance_squared = dx * dx + dy * dy
+    if distance_squared < limit * limit:
+        return first[3], second[3], dx, dy, math.sqrt(distance_squared)
+    return None
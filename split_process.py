@@ -0,0 +1,334 @@
+""" Split mode (settings.SPLIT_PROCESSES) - the simulation runs in a worker process and the window process
+only draws, so they each get a core and the tick rate doesn't depend on the frame rate.
+The worker publishes the entity state after every tick into one of two buffers in a
+multiprocessing.shared_memory block (Snapshot_Writer) and the window process draws the newest complete one
+(Snapshot_Reader). Input goes the other way as Input_Snapshots over a Pipe.
+Each buffer starts with a sequence number that is odd while the buffer is being written (a seqlock), so a
+reader never uses a half written snapshot. Recording and replays aren't supported in split mode. """
+# pylint: disable=no-member
+import array
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+import headless
+import input_snapshot
+import main as main_module
+import rect
+import settings
+import zombie
+import zombie_store
+from weapons import pistol
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional - without it there are no array zombies or projectiles to send.
+    numpy = None
+
+# Values at the start of every buffer, then the zombies, shots and projectiles (a row of values each).
+HEADER = ("sequence", "published", "dtime", "game_time", "score", "pause", "player_x", "player_y",
+          "player_previous_x", "player_previous_y", "player_rotation", "player_health", "player_max_health",
+          "player_running_time", "gun", "clip", "reloading", "zombies", "shots", "projectiles")
+ZOMBIE = ("x", "y", "previous_x", "previous_y", "rotation", "radius", "health", "max_health", "running_time")
+SHOT = ("x1", "y1", "x2", "y2")
+PROJECTILE = ("x", "y", "vx", "vy")
+INDEX = {name: index for index, name in enumerate(HEADER)}
+
+
+class Snapshot_Layout:
+    """ Where everything is in the shared block, counted in doubles.
+    The block is [latest buffer, 0] then two buffers of header + zombie, shot and projectile rows. """
+    def __init__(self, max_zombies, max_shots, max_projectiles):
+        self.max_zombies = max_zombies
+        self.max_shots = max_shots
+        self.max_projectiles = max_projectiles
+        self.zombies = len(HEADER)
+        self.shots = self.zombies + max_zombies * len(ZOMBIE)
+        self.projectiles = self.shots + max_shots * len(SHOT)
+        self.buffer_size = self.projectiles + max_projectiles * len(PROJECTILE)
+
+    def get_values(self):
+        """ Return the arguments to make the same layout (it's sent to the worker process). """
+        return self.max_zombies, self.max_shots, self.max_projectiles
+
+    def size(self):
+        """ Size of the whole shared block in bytes. """
+        return (2 + 2 * self.buffer_size) * 8
+
+    def buffer_start(self, buffer):
+        """ Index of the start of buffer (0 or 1). """
+        return 2 + buffer * self.buffer_size
+
+
+class Snapshot:
+    """ One tick of entity state read from the shared block.
+    header is a dictionary (HEADER names), the rest are flat lists of the rows. """
+    def __init__(self, header, zombies, shots, projectiles):
+        self.header = header
+        self.zombies = zombies
+        self.shots = shots
+        self.projectiles = projectiles
+
+
+class Snapshot_Writer:
+    """ Publishes a game's state into the shared block (used by the worker process). """
+    def __init__(self, buffer, layout):
+        self.view = buffer.cast("d")
+        self.layout = layout
+        self.published = 0
+
+    def publish(self, game, dtime):
+        """ Write game into the buffer that isn't the latest, then make it the latest. """
+        view = self.view
+        layout = self.layout
+        target = 1 - int(view[0])
+        start = layout.buffer_start(target)
+        self.published += 1
+        view[start] = self.published * 2 - 1  # Odd - being written.
+        zombies = zombie_rows(game.zombie_handler, layout.max_zombies)
+        shots = shot_rows(game.shot_handler, layout.max_shots)
+        projectiles = projectile_rows(game.projectile_handler, layout.max_projectiles)
+        player = game.player
+        header = (time.monotonic(), dtime, game.time, game.score, game.pause, player.pos.x, player.pos.y,
+                  player.previous_pos.x, player.previous_pos.y, player.rotation, player.health, player.max_health,
+                  -1 if player.running_time is None else player.running_time, player.guns.index(player.gun),
+                  player.gun.clip, player.gun.reloading, len(zombies) // len(ZOMBIE), len(shots) // len(SHOT),
+                  len(projectiles) // len(PROJECTILE))
+        view[start + 1:start + len(HEADER)] = array.array("d", header)
+        write_rows(view, start + layout.zombies, zombies)
+        write_rows(view, start + layout.shots, shots)
+        write_rows(view, start + layout.projectiles, projectiles)
+        view[start] = self.published * 2  # Even - finished.
+        view[0] = target
+
+    def release(self):
+        """ Let go of the shared block (it can't be closed while this view exists). """
+        self.view.release()
+
+
+class Snapshot_Reader:
+    """ Reads the latest complete snapshot from the shared block (used by the window process). """
+    def __init__(self, buffer, layout):
+        self.view = buffer.cast("d")
+        self.layout = layout
+        self.sequence = 0  # Of the last snapshot read.
+
+    def read(self):
+        """ Return the latest Snapshot, or None if there isn't a new complete one. """
+        view = self.view
+        layout = self.layout
+        for _ in range(3):
+            start = layout.buffer_start(int(view[0]))
+            sequence = view[start]
+            if sequence == self.sequence:
+                return None
+            if sequence % 2:  # Being written - the writer has lapped us, try again.
+                continue
+            header = dict(zip(HEADER, view[start:start + len(HEADER)].tolist()))
+            zombies = read_rows(view, start + layout.zombies, header["zombies"], len(ZOMBIE))
+            shots = read_rows(view, start + layout.shots, header["shots"], len(SHOT))
+            projectiles = read_rows(view, start + layout.projectiles, header["projectiles"], len(PROJECTILE))
+            if view[start] == sequence:
+                self.sequence = sequence
+                return Snapshot(header, zombies, shots, projectiles)
+        return None
+
+    def release(self):
+        """ Let go of the shared block (it can't be closed while this view exists). """
+        self.view.release()
+
+
+def zombie_rows(handler, most):
+    """ Return a flat sequence of ZOMBIE values for (up to most of) the handler's zombies. """
+    if isinstance(handler, zombie_store.Array_Zombie_Handler):  # Straight from the arrays.
+        count = min(handler.count, most)
+        return numpy.column_stack([getattr(handler, name)[:count] for name in ZOMBIE]).ravel()
+    rows = []
+    for each in handler.zombies[:most]:
+        pos = each.pos
+        previous = each.previous_pos
+        rows.extend((pos.x, pos.y, previous.x, previous.y, each.rotation, each.radius, each.health, each.max_health,
+                     each.running_time))
+    return rows
+
+
+def shot_rows(handler, most):
+    """ Return a flat list of SHOT values for (up to most of) the shots. """
+    rows = []
+    for shot in handler.shots[:most]:
+        rows.extend((shot.point1.x, shot.point1.y, shot.point2.x, shot.point2.y))
+    return rows
+
+
+def projectile_rows(handler, most):
+    """ Return a flat sequence of PROJECTILE values for (up to most of) the projectiles (empty if there are none). """
+    if handler is None or not handler.count:
+        return []
+    count = min(handler.count, most)
+    return numpy.column_stack([getattr(handler, name)[:count] for name in PROJECTILE]).ravel()
+
+
+def write_rows(view, start, rows):
+    """ Copy rows (a flat list or NumPy array of floats) into view from start.
+    NumPy arrays are copied as one block of bytes rather than a float at a time. """
+    if not len(rows):
+        return
+    if isinstance(rows, list):
+        rows = array.array("d", rows)
+    view[start:start + len(rows)] = memoryview(rows).cast("B").cast("d")
+
+
+def read_rows(view, start, count, width):
+    """ Return a flat list of count rows of width values from start. """
+    return view[start:start + int(count) * width].tolist()
+
+
+def simulate(connection, name, layout_values, seed, dtime):
+    """ The worker process - run the game at one tick every dtime seconds, publishing every tick to the shared
+    block called name. Input arrives on connection (None means stop). """
+    block = shared_memory.SharedMemory(name=name)
+    writer = Snapshot_Writer(block.buf, Snapshot_Layout(*layout_values))
+    headless_main = headless.Headless_Main(dtime, seed)
+    inputs = input_snapshot.EMPTY
+    next_tick = time.monotonic()
+    try:
+        while True:
+            while connection.poll():
+                received = connection.recv()
+                if received is None:
+                    return
+                inputs = inputs.combine(received)
+            now = time.monotonic()
+            if now < next_tick:
+                connection.poll(next_tick - now)  # Wait for input or the next tick, whichever comes first.
+                continue
+            if now - next_tick > dtime * settings.MAX_TICKS_PER_FRAME:
+                next_tick = now  # Too far behind - slow down rather than catch up.
+            headless_main.tick(inputs)
+            inputs = inputs.held_only()
+            next_tick += dtime
+            writer.publish(headless_main.game, dtime)
+    finally:
+        writer.release()
+        block.close()
+
+
+class Split_Main(main_module.Main):
+    """ Main for split mode - self.game is only a copy of the worker's game for drawing (it's never updated).
+    Each frame the input is sent to the worker and the newest snapshot is copied into self.game. """
+    def __init__(self):
+        main_module.Main.__init__(self)
+        self.game.zombie_handler = zombie.Zombie_Handler()  # Filled from the snapshots, whatever the settings.
+        self.layout = Snapshot_Layout(settings.SPLIT_MAX_ZOMBIES, settings.SPLIT_MAX_SHOTS,
+                                      settings.SPLIT_MAX_PROJECTILES)
+        self.block = shared_memory.SharedMemory(create=True, size=self.layout.size())
+        self.reader = Snapshot_Reader(self.block.buf, self.layout)
+        self.published = None  # When the last snapshot drawn was published (time.monotonic).
+        self.snapshot_dtime = self.dtime
+        context = multiprocessing.get_context("spawn")  # A fresh process - not a copy of this one's window.
+        self.connection, worker_connection = context.Pipe()
+        self.worker = context.Process(target=simulate, name="simulation", daemon=True,
+                                      args=(worker_connection, self.block.name, self.layout.get_values(),
+                                            self.game.seed, self.dtime or 1 / 60))
+        self.worker.start()
+
+    def simulate(self, inputs):
+        """ Send inputs to the worker and copy the newest snapshot into self.game.
+        Sets self.interpolation from how long ago that snapshot was published. """
+        self.connection.send(inputs)
+        snapshot = self.profiler.measure("snapshot", self.reader.read)
+        self.ticks = 0
+        if snapshot is not None:
+            self.profiler.measure("snapshot", self.apply, snapshot)
+            self.ticks = 1
+        if self.published is None:
+            self.interpolation = 1
+        else:
+            self.interpolation = min(1, max(0, (time.monotonic() - self.published) / self.snapshot_dtime))
+
+    def apply(self, snapshot):
+        """ Copy snapshot into self.game. """
+        header = snapshot.header
+        game = self.game
+        self.published = header["published"]
+        self.snapshot_dtime = header["dtime"]
+        game.time = header["game_time"]
+        game.score = int(header["score"])
+        pause = bool(header["pause"])
+        if pause != game.pause:
+            game.pause = pause
+            game.set_grab(not pause)
+        self.apply_player(header)
+        self.apply_zombies(snapshot.zombies)
+        self.apply_shots(snapshot.shots)
+        self.apply_projectiles(snapshot.projectiles)
+        if game.flow_field is not None:
+            game.flow_field.update(game.player.pos.x, game.player.pos.y)
+
+    def apply_player(self, header):
+        """ Copy the player's values from a snapshot header. """
+        player = self.game.player
+        player.pos.set(header["player_x"], header["player_y"])
+        player.previous_pos.set(header["player_previous_x"], header["player_previous_y"])
+        player.rotation = header["player_rotation"]
+        player.health = header["player_health"]
+        player.max_health = header["player_max_health"]
+        player.running_time = header["player_running_time"] if header["player_running_time"] >= 0 else None
+        player.gun = player.guns[int(header["gun"])]
+        player.gun.clip = int(header["clip"])
+        player.gun.reloading = header["reloading"]
+
+    def apply_zombies(self, rows):
+        """ Make self.game's zombies match rows (flat ZOMBIE values). """
+        handler = self.game.zombie_handler
+        zombies = handler.zombies
+        count = len(rows) // len(ZOMBIE)
+        while len(zombies) < count:
+            zombies.append(handler.pool.acquire(self))
+        while len(zombies) > count:
+            handler.pool.release(zombies.pop())
+        for index, each in enumerate(zombies):
+            x, y, previous_x, previous_y, each.rotation, each.radius, each.health, each.max_health, \
+                each.running_time = rows[index * len(ZOMBIE):(index + 1) * len(ZOMBIE)]
+            each.pos.set(x, y)
+            each.previous_pos.set(previous_x, previous_y)
+
+    def apply_shots(self, rows):
+        """ Make self.game's shots match rows (flat SHOT values). """
+        shots = self.game.shot_handler.shots
+        count = len(rows) // len(SHOT)
+        while len(shots) < count:
+            shots.append(pistol.Pistol_Shot(rect.Vec2(), 0, [], 0, 0))
+        del shots[count:]
+        for index, shot in enumerate(shots):
+            start = index * len(SHOT)
+            shot.point1.set(rows[start], rows[start + 1])
+            shot.point2.set(rows[start + 2], rows[start + 3])
+
+    def apply_projectiles(self, rows):
+        """ Make self.game's projectiles match rows (flat PROJECTILE values). """
+        handler = self.game.projectile_handler
+        if handler is None:
+            return
+        count = len(rows) // len(PROJECTILE)
+        if count > len(handler.x):
+            for name in PROJECTILE:
+                setattr(handler, name, numpy.zeros(count))
+        values = numpy.array(rows).reshape(count, len(PROJECTILE))
+        for column, name in enumerate(PROJECTILE):
+            getattr(handler, name)[:count] = values[:, column]
+        handler.count = count
+
+    def close(self):
+        """ Stop the worker and free the shared block. """
+        main_module.Main.close(self)
+        try:
+            self.connection.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.worker.join(1)
+        if self.worker.is_alive():
+            self.worker.terminate()
+        self.reader.release()
+        self.block.close()
+        self.block.unlink()
+
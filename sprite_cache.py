@@ -0,0 +1,63 @@
+""" Sprite_Cache object - keeps scaled and rotated copies of images so they aren't
+re-transformed every frame. """
+import math
+from collections import OrderedDict
+import pygame
+
+
+class Sprite_Cache:
+    """ Bounded LRU cache of transformed surfaces.
+    Keyed by (image, quantized angle, target pixel size). """
+    def __init__(self, max_size=2048, angle_step=3):
+        self.max_size = max_size
+        self.angle_step = angle_step  # Degrees, rotations are rounded to a multiple of this.
+        self.surfaces = OrderedDict()
+        self.textures = {}  # id(source): (texture number, source) - the source is kept so the id isn't reused.
+        self.hits = 0
+        self.misses = 0
+
+    def quantize(self, angle):
+        """ Round angle (radians) to the nearest multiple of self.angle_step (degrees). """
+        degrees = -math.degrees(angle)
+        return (round(degrees / self.angle_step) * self.angle_step) % 360
+
+    def get(self, image, angle, size):
+        """ Return image scaled to size (w, h in pixels) and rotated by angle (radians). """
+        key = (image, self.quantize(angle), size)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        scaled_image = pygame.transform.scale(image, size)
+        surface = pygame.transform.rotate(scaled_image, key[1])
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def texture(self, source):
+        """ Return a number (from 1) for source - an image, or a list of animation frames - that stays the
+        same for every scaled and rotated copy, for Render_Queue to sort blits by. """
+        entry = self.textures.get(id(source))
+        if entry is None:
+            entry = self.textures[id(source)] = (len(self.textures) + 1, source)
+        return entry[0]
+
+    def hit_rate(self):
+        """ Fraction of lookups that didn't need a transform (0 if nothing looked up yet). """
+        lookups = self.hits + self.misses
+        if not lookups:
+            return 0
+        return self.hits / lookups
+
+    def clear(self):
+        """ Forget all the surfaces (e.g. the window has changed size) and reset the counters. """
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __str__(self):
+        """ return string in format "Sprite_Cache(size/max_size, hit rate)". """
+        return "Sprite_Cache({}/{}, {:.1%} hits)".format(len(self.surfaces), self.max_size, self.hit_rate())
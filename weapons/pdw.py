@@ -1,6 +1,39 @@
-import pistol
+""" Contains the PDW class. """
+import math
+from weapons import pistol
 
 
-class pdw(pistol.pistol):
+class PDW(pistol.Pistol):
+    """ Automatic, fires travelling bullets (main.game.projectile_handler) while the mouse is held.
+    Falls back to pistol shots if projectiles aren't available. """
     def __init__(self):
-        pistol.pistol.__init__()
+        pistol.Pistol.__init__(self)
+        self.automatic = True
+        self.clip_size = 30
+        self.clip = self.clip_size
+        self.reload_time = 1.5  # seconds
+        self.damage = 12
+        self.fire_delay = 1 / 12  # Seconds between shots.
+        self.fire_cool_down = 0
+        self.bullet_speed = 1.6  # Screen widths per second.
+        self.bullet_life = 1  # Seconds.
+
+    def update(self, main, inputs):
+        """ Update function, called every frame. """
+        self.reload(main, inputs)
+        self.fire_cool_down = max(0, self.fire_cool_down - main.dtime)
+
+    def shoot(self, main):
+        """ Fire a bullet, if the gun is ready to fire again. """
+        if self.fire_cool_down or self.clip <= 0 or self.reloading:
+            return
+        if main.game.projectile_handler is None:
+            pistol.Pistol.shoot(self, main)
+        else:
+            origin = main.game.player.hand_pos()
+            for angle in self.pellet_angles(main.game.player.rotation):
+                main.game.projectile_handler.fire(origin.x, origin.y, math.cos(angle) * self.bullet_speed,
+                                                  math.sin(angle) * self.bullet_speed, self.damage,
+                                                  self.bullet_life)
+            self.clip -= 1
+        self.fire_cool_down = self.fire_delay
@@ -1,96 +1,201 @@
 """ Zombie and Zombie_Handler classes. """
-import time
-import random
 import math
 import rect
+import ai_scheduler
 import character
+import pool
+import settings
+import spatial_hash
 
 
 class Zombie_Handler:
     """ Runs all the zombie stuff so the main game just has to run update and shot for this. """
     def __init__(self):
         self.zombies = []
+        self.pool = pool.Pool(Zombie)  # Dead zombies, to be reused when new ones spawn.
         self.time_until_spawn = 0
+        self.visible_count = 0
+        self.detail = 0
+        self.grid = spatial_hash.Spatial_Hash()
+        self.scheduler = None
+        if settings.AI_SCHEDULER:
+            self.scheduler = ai_scheduler.AI_Scheduler(settings.AI_SLICES, settings.AI_NEAR_DISTANCE,
+                                                       settings.AI_BUDGET)
 
     def spawn(self, main):
-        """ Spawn a zombie every now and again. How often depends on score.
+        """ Spawn a zombie every now and again. How often depends on score (main.game.difficulty).
         If lots of spawn time has gone by spawn lots of zombies. """
         spawn_num = int(-self.time_until_spawn)
         self.time_until_spawn -= main.dtime
-        spawn_time = 2 / (main.game.score / 50 + 1)
+        spawn_time = main.game.difficulty.time_between_spawns(main.game.score)
         for _ in range(spawn_num):
-            self.zombies.append(Zombie(main))
+            self.add(self.pool.acquire(main))
             self.time_until_spawn += spawn_time
 
+    def add(self, zombie):
+        """ Start handling zombie. """
+        self.zombies.append(zombie)
+
     def update(self, main):
-        """ Update the zombies, spawn them. """
+        """ Update the zombies, spawn them.
+        If there's an AI scheduler it decides which zombies steer this frame (they all still move).
+        Then rebuild self.grid (pushing overlapping zombies apart first if settings.ZOMBIE_SEPARATION). """
         self.spawn(main)
         self.validate(main)
+        if self.scheduler is not None:
+            self.scheduler.update(main, self.zombies, self.grid)
+        else:
+            for zombie in self.zombies:
+                zombie.update(main)
+        self.update_grid()
+
+    def save_positions(self):
+        """ Remember every zombie's position at the start of a tick (for drawing between ticks). """
         for zombie in self.zombies:
-            zombie.update(main)
+            zombie.save_pos()
+
+    def update_grid(self):
+        """ Rebuild self.grid from the zombies' positions, separating them if that's turned on. """
+        self.rebuild_grid()
+        if settings.ZOMBIE_SEPARATION:
+            self.separate()
+            self.rebuild_grid()
+
+    def rebuild_grid(self):
+        """ Put all the zombies in self.grid. """
+        self.grid.rebuild(self.zombies)
+
+    def separate(self):
+        """ Push every pair of overlapping zombies apart (each moves half the overlap). """
+        pushes = {}
+        for first, second, dx, dy, distance in self.grid.overlapping_pairs():
+            if distance == 0:
+                dx, dy, distance = 1, 0, 1
+            push = (first.radius + second.radius - distance) / (2 * distance)
+            for zombie, direction in ((first, -push), (second, push)):
+                total = pushes.setdefault(id(zombie), [zombie, 0, 0])
+                total[1] += dx * direction
+                total[2] += dy * direction
+        for zombie, push_x, push_y in pushes.values():
+            pos = zombie.pos
+            pos.x += push_x
+            pos.y += push_y
+            zombie.pos = pos
 
     def show(self, main):
-        """ Show all the zombies. """
-        for zombie in self.zombies:
-            zombie.show(main)
-            
+        """ Show all the zombies that are on screen.
+        How much detail they're drawn with depends on how many are visible. """
+        visible = [zombie for zombie in self.zombies if zombie.is_on_screen()]
+        self.visible_count = len(visible)
+        self.detail = level_of_detail(self.visible_count)
+        for zombie in visible:
+            zombie.show(main, self.detail)
+
     def validate(self, main):
-        """ Forget about all the dead zombies. """
-        zombies = []
-        for zombie in self.zombies:
+        """ Forget about all the dead zombies (giving them back to the pool).
+        A dead zombie is swapped with the last zombie and popped, so the list isn't rebuilt. """
+        zombies = self.zombies
+        index = 0
+        while index < len(zombies):
+            zombie = zombies[index]
             if zombie.health > 0:
-                zombies.append(zombie)
-        main.game.score += len(self.zombies) - len(zombies)
-        self.zombies = zombies
+                index += 1
+                continue
+            zombies[index] = zombies[-1]
+            zombies.pop()
+            self.pool.release(zombie)
+            main.game.score += 1
 
 
 class Zombie(character.Character):
     """ Cool as zombie class.
-    Speed and health depend on player score. """
+    Speed and health depend on player score (main.game.difficulty).
+    Zombies are pooled - reset sets up a used zombie as a new one. """
+    __slots__ = ("velocity", "moving", "running_time", "damage", "hit_cool_down")
+
     def __init__(self, main):
+        self.pos = rect.Vec2()
+        self.previous_pos = rect.Vec2()
+        self.reset(main)
+
+    def reset(self, main):
+        """ Set up the zombie as if it's just spawned. """
         self.rotation = 0
         self.radius = 0.015
-        self.velocity = min(0.1 + main.game.score / 1000, 3)
-        self.set_pos()
-        self.alive = True
-        self.spawn_time = time.time()
+        self.velocity = main.game.difficulty.zombie_velocity(main.game.score)
+        self.set_pos(main.game.rng)
         self.running_time = 0
         self.damage = 10
         self.hit_cool_down = 0  # How much longer until the zombie can hit the player?
-        self.max_health = 24 * (1 + main.game.score / 5)
+        self.max_health = main.game.difficulty.zombie_health(main.game.score)
         self.health = self.max_health
+        self.moving = True
+        self.steer(main)
 
-    def set_pos(self):
-        """ Choose a spawn point for the zombie. """
-        pos = rect.Pos(random.random(), random.choice([-self.radius, 1 + self.radius]))
-        # pos = rect.Pos(0.5, 0.5)
-        if random.choice([True, False]):
-            self.pos = rect.Pos(pos.y, pos.x)
-        else:
-            self.pos = pos
+    def set_pos(self, rng):
+        """ Choose a spawn point for the zombie (with rng, the game's random.Random).
+        The zombie's vectors are reused, so a pooled zombie doesn't make new ones. """
+        pos = self.pos
+        pos.set(rng.random(), rng.choice([-self.radius, 1 + self.radius]))
+        # pos.set(0.5, 0.5)
+        if rng.choice([True, False]):
+            pos.set(pos.y, pos.x)
+        self.previous_pos.set_from(pos)
 
-    def move(self, main):
-        """ Point the zombie in the right direction (Towards the player) and move it a little.
+    def steer(self, main):
+        """ Point the zombie in the right direction (Towards the player) and decide if it should move.
         The zombie will stop moving if the distance from the zombie to the player is 0.75 of the
-        sum of the radii. """
-        self.rotation = math.atan2(main.game.player.pos.y - self.pos.y,
-                                   main.game.player.pos.x - self.pos.x)
-        distance = self.pos.distance(main.game.player)
-        if distance >= (self.radius + main.game.player.radius) * 0.75:
+        sum of the radii.
+        If there's a flow field the direction comes from that (unless it says to go straight for the player). """
+        angle = None
+        if main.game.flow_field is not None:
+            angle = main.game.flow_field.angle(self.pos.x, self.pos.y)
+        if angle is None:
+            angle = math.atan2(main.game.player.pos.y - self.pos.y,
+                               main.game.player.pos.x - self.pos.x)
+        self.rotation = angle
+        distance = self.pos.distance(main.game.player.pos)
+        self.moving = distance >= (self.radius + main.game.player.radius) * 0.75
+
+    def move(self, main):
+        """ Move the zombie a little in the direction it's pointing (if it's moving). """
+        if self.moving:
             self.pos.y += math.sin(self.rotation) * self.velocity * main.dtime
             self.pos.x += math.cos(self.rotation) * self.velocity * main.dtime
 
     def update(self, main):
-        """ Move, rotate """
+        """ Rotate, move, update timers """
+        self.steer(main)
+        self.advance(main)
+
+    def advance(self, main):
+        """ Move and update timers - everything but steering (see ai_scheduler). """
         self.move(main)
         self.hit_cool_down = max(0, self.hit_cool_down - main.dtime)
         self.running_time += main.dtime
 
-    def show(self, main):
-        """ Show the zombie. """
-        image_number = (7 * self.running_time) % len(main.images["zombie"])
-        image = main.images["zombie"][str(int(image_number))]
+    def show(self, main, detail=0):
+        """ Show the zombie.
+        detail is the level of detail from level_of_detail - 0 is everything. 1 has no shadow.
+        2 also isn't rotated and only has a health bar once it's been hit. """
+        frames = main.images["zombie"]
+        image = frames[int(7 * self.running_time) % len(frames)]
         # self.show_hit_circle(main, (255, 0, 0))
-        self.show_shadow(main)
-        self.show_image(image, main)
-        self.show_health_bar(main)
\ No newline at end of file
+        if detail < 1:
+            self.show_shadow(main)
+        if detail < 2:
+            self.show_image(image, main, texture=frames)  # Every frame sorts the same, so overlaps don't flicker.
+            self.show_health_bar(main)
+        else:
+            self.show_image(image, main, rotation=0, texture=frames)
+            self.show_health_bar(main, hide_full_health=True)
+
+
+def level_of_detail(visible_count):
+    """ How much detail to draw zombies with when visible_count of them are on screen.
+    See Zombie.show. """
+    if visible_count >= settings.LOD_SIMPLE_ZOMBIES:
+        return 2
+    if visible_count >= settings.LOD_NO_SHADOWS:
+        return 1
+    return 0
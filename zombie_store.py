@@ -0,0 +1,179 @@
+""" Array_Zombie_Handler - an optional replacement for zombie.Zombie_Handler that keeps every zombie
+in NumPy arrays (one array per attribute) and updates them all at once.
+Zombie_View gives the code that wants one zombie at a time (shooting, drawing) a Zombie-like object. """
+import ai_scheduler
+import pool
+import rect
+import settings
+import spatial_hash
+import zombie
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional - without it the normal Zombie_Handler is used.
+    numpy = None
+
+# Attributes stored in arrays, all copied from a Zombie when it's added.
+FIELDS = ("x", "y", "rotation", "moving", "velocity", "radius", "damage", "health", "max_health",
+          "hit_cool_down", "running_time")
+# Every array - the positions at the start of the tick too (for drawing between ticks).
+ARRAYS = FIELDS + ("previous_x", "previous_y")
+
+
+def available():
+    """ Can the array handler be used (is NumPy installed)? """
+    return numpy is not None
+
+
+class Array_Zombie_Handler(zombie.Zombie_Handler):
+    """ Zombie_Handler with the zombies stored as arrays.
+    self.zombies is a list of Zombie_View objects - views are only valid until the next update. """
+    # pylint: disable=super-init-not-called
+    def __init__(self, capacity=256):
+        self.time_until_spawn = 0
+        self.visible_count = 0
+        self.detail = 0
+        self.grid = spatial_hash.Spatial_Hash()
+        self.pool = pool.Pool(zombie.Zombie)
+        self.scheduler = None
+        if settings.AI_SCHEDULER:
+            self.scheduler = ai_scheduler.AI_Scheduler(settings.AI_SLICES, settings.AI_NEAR_DISTANCE,
+                                                       settings.AI_BUDGET)
+        self.count = 0
+        self.views = []
+        for name in ARRAYS:
+            setattr(self, name, numpy.zeros(capacity))  # Only the first self.count are zombies.
+
+    @property
+    def zombies(self):
+        """ List of views of the zombies. """
+        return self.views[:self.count]
+
+    def add(self, new_zombie):
+        """ Copy new_zombie's attributes into the end of the arrays (growing them if they're full).
+        new_zombie is given back to the pool afterwards - it's only used to set up the arrays. """
+        if self.count == len(self.x):
+            for name in ARRAYS:
+                array = getattr(self, name)
+                setattr(self, name, numpy.concatenate((array, numpy.zeros(len(array)))))
+        index = self.count
+        self.x[index] = self.previous_x[index] = new_zombie.pos.x
+        self.y[index] = self.previous_y[index] = new_zombie.pos.y
+        for name in FIELDS[2:]:
+            getattr(self, name)[index] = getattr(new_zombie, name)
+        self.count += 1
+        self.pool.release(new_zombie)
+        while len(self.views) < self.count:
+            self.views.append(Zombie_View(self, len(self.views)))
+
+    def update(self, main):
+        """ Spawn, forget the dead zombies, then steer and move them all towards the player (or along the
+        flow field) and update timers. With an AI scheduler only some of them steer each frame. """
+        self.spawn(main)
+        self.validate(main)
+        count = self.count
+        x, y = self.x[:count], self.y[:count]
+        player = main.game.player
+        dx = player.pos.x - x
+        dy = player.pos.y - y
+        distance = numpy.hypot(dx, dy)
+        steer = self.scheduler.steer_mask(distance) if self.scheduler is not None else slice(None)
+        rotation = numpy.arctan2(dy[steer], dx[steer])
+        if main.game.flow_field is not None:
+            field = main.game.flow_field.angles_at(x[steer], y[steer])
+            rotation = numpy.where(numpy.isnan(field), rotation, field)
+        self.rotation[:count][steer] = rotation
+        # The zombie stops moving once the distance to the player is 0.75 of the sum of the radii.
+        self.moving[:count][steer] = distance[steer] >= (self.radius[:count][steer] + player.radius) * 0.75
+        rotation = self.rotation[:count]
+        step = self.velocity[:count] * main.dtime * self.moving[:count]
+        x += numpy.cos(rotation) * step
+        y += numpy.sin(rotation) * step
+        hit_cool_down = self.hit_cool_down[:count]
+        numpy.maximum(hit_cool_down - main.dtime, 0, out=hit_cool_down)
+        self.running_time[:count] += main.dtime
+        self.update_grid()
+
+    def save_positions(self):
+        """ Copy the positions into previous_x and previous_y. """
+        self.previous_x[:self.count] = self.x[:self.count]
+        self.previous_y[:self.count] = self.y[:self.count]
+
+    def rebuild_grid(self):
+        """ Put all the zombies in self.grid, reading the positions straight from the arrays. """
+        count = self.count
+        self.grid.rebuild_from(zip(self.x[:count].tolist(), self.y[:count].tolist(),
+                                   self.radius[:count].tolist(), self.views[:count]))
+
+    def validate(self, main):
+        """ Forget about all the dead zombies (moving the living ones down to fill the gaps). """
+        alive = self.health[:self.count] > 0
+        living = int(numpy.count_nonzero(alive))
+        if living == self.count:
+            return
+        for name in ARRAYS:
+            array = getattr(self, name)
+            array[:living] = array[:self.count][alive]
+        main.game.score += self.count - living
+        self.count = living
+
+    def show(self, main):
+        """ Show all the zombies that are on screen (Zombie_Handler.show, with the culling done on the arrays). """
+        count = self.count
+        reach = self.radius[:count] * 2.5
+        x, y = self.x[:count], self.y[:count]
+        visible = numpy.flatnonzero((x > -reach) & (x < 1 + reach) & (y > -reach) & (y < 1 + reach))
+        self.visible_count = len(visible)
+        self.detail = zombie.level_of_detail(self.visible_count)
+        for index in visible.tolist():
+            self.views[index].show(main, self.detail)
+
+
+def array_property(name):
+    """ Make a Zombie_View property that reads and writes the handler's array called name. """
+    def get(view):
+        return float(getattr(view.handler, name)[view.index])
+
+    def set_value(view, value):
+        getattr(view.handler, name)[view.index] = value
+    return property(get, set_value)
+
+
+class Zombie_View(zombie.Zombie):
+    """ One zombie in an Array_Zombie_Handler. Reads and writes go straight to the arrays.
+    pos is a copy - assign a new pos to move the zombie. """
+    # pylint: disable=super-init-not-called
+    __slots__ = ("handler", "index")
+
+    def __init__(self, handler, index):
+        self.handler = handler
+        self.index = index
+
+    rotation = array_property("rotation")
+    moving = array_property("moving")
+    velocity = array_property("velocity")
+    radius = array_property("radius")
+    damage = array_property("damage")
+    health = array_property("health")
+    max_health = array_property("max_health")
+    hit_cool_down = array_property("hit_cool_down")
+    running_time = array_property("running_time")
+
+    @property
+    def pos(self):
+        """ A copy of the position. """
+        return rect.Vec2(float(self.handler.x[self.index]), float(self.handler.y[self.index]))
+
+    @pos.setter
+    def pos(self, pos):
+        self.handler.x[self.index] = pos.x
+        self.handler.y[self.index] = pos.y
+
+    def draw_pos(self, main):
+        """ Character.draw_pos, from the arrays. """
+        handler = self.handler
+        index = self.index
+        alpha = main.interpolation
+        x = float(handler.previous_x[index])
+        y = float(handler.previous_y[index])
+        return x + (float(handler.x[index]) - x) * alpha, y + (float(handler.y[index]) - y) * alpha